@@ -1,13 +1,36 @@
-from collections import deque
+import os
 
 import numpy as np
 from PIL import Image, ImageDraw
-from numba import u8, u1
+from numba import u8, u1, cuda, njit, prange, set_num_threads
 
-from quadtree import QuadTree
-from .normal_quadtree import calculate_quadtree, compute_fast_quadtree
-from .mixed_quadtree import calculate_mixed, fast_mixed_quadtree
-from .raster import compute_raster
+from .calculation import make_calculate, make_calculate_grid, colorize_kernels, colorize_grayscale
+from .normal_quadtree import calculate_quadtree, compute_fast_quadtree, compute_fast_quadtree_serial
+from .mixed_quadtree import calculate_mixed, fast_mixed_quadtree, fast_mixed_quadtree_serial, mark_and_fill
+from .raster import compute_raster, compute_dwell_indices
+from .coloring import hsv_to_rgb
+from .cuda_raster import compute_raster_cuda
+
+set_num_threads(os.cpu_count())
+
+
+@njit(parallel=True)
+def _warm_thread_pool():
+    """
+    Trivial parallel kernel run once at import so the worker-thread pool is already spun up when
+    the first real kernel is dispatched.
+    """
+    total = 0
+    for i in prange(1):
+        total += i
+    return total
+
+
+_warm_thread_pool()
+
+# Levels smaller than this run on the serial quadtree kernels: parallel dispatch costs more than
+# the few boxes are worth.
+MIN_PARALLEL_BOXES = 8
 
 
 class AcceleratedMandelbrot:
@@ -24,6 +47,7 @@ class AcceleratedMandelbrot:
                  mixed_raster=False,
                  fast_quadtree = True,
                  show_quadtree=False,
+                 use_cuda=False,
                  ):
 
         """
@@ -42,6 +66,7 @@ class AcceleratedMandelbrot:
         - mixed_raster (bool): Use mixed raster mode.
         - fast_quadtree (bool): Use fast quadtree mode.
         - show_quadtree (bool): Show quadtree boundaries in the output image.
+        - use_cuda (bool): Run the raster path on the GPU when a CUDA device is available.
         """
 
         self.size = size
@@ -50,6 +75,7 @@ class AcceleratedMandelbrot:
 
         self.raster = raster
         self.mixed_raster = mixed_raster
+        self.use_cuda = use_cuda and raster and cuda.is_available()
         self.period_checking = True
         self.fast_quadtree = fast_quadtree if not self.raster else False
 
@@ -57,16 +83,57 @@ class AcceleratedMandelbrot:
         height = scale * size[1]
         offset = center + np.array([-width, height]) / 2
 
-        self.quad_tree = QuadTree(np.zeros(2, dtype=np.int32), np.array([size[0], size[1]], dtype=np.int32))
-        self.x = np.linspace(0, size[0], num=size[0], dtype=np.float64) * scale + offset[0]
-        self.y = np.linspace(0, size[1], num=size[1], dtype=np.float64) * -scale + offset[1]
-
-        self.y = np.abs(self.y)
-
-        self.pixels = np.zeros((size[1], size[0], 3), dtype=np.uint8)
+        # Double precision only earns its keep at deep zoom, where neighbouring pixel
+        # coordinates collide in FP32; every shallower view runs the whole coordinate pipeline in
+        # FP32, which halves the bandwidth of the iteration state and doubles the SIMD lane count.
+        self.coord_dtype = np.float64 if width < 1e-5 else np.float32
+
+        # Coordinate lookup arrays are built once, kept C-contiguous and passed by reference to every
+        # kernel so no per-level recomputation or copying happens inside the hot loops. x is built
+        # from the exact affine expression x0 + i*dx, evaluated in the render precision, so kernels
+        # that generate lane coordinates inline produce bit-identical values to these array loads.
+        # y stays an array because the symmetric fold below makes it non-affine.
+        self.x0 = self.coord_dtype(offset[0])
+        self.dx = self.coord_dtype(scale * (size[0] / (size[0] - 1)))
+        self.x = np.ascontiguousarray(self.x0 + np.arange(size[0], dtype=self.coord_dtype) * self.dx)
+        self.y = np.ascontiguousarray(
+            np.linspace(0, size[1], num=size[1], dtype=self.coord_dtype) * -float(scale) + float(offset[1]))
+
+        self.symmetric = float(center[1]) == 0.0
+
+        # The set is symmetric about the real axis, so for views centered on it folding y onto the
+        # upper half-plane lets mirrored quadtree boxes collapse to the same colors. Off-axis views
+        # keep the correctly signed axis — folding them would corrupt the render.
+        if self.symmetric:
+            self.y = np.abs(self.y)
+
+        # RGBA layout: the 4-byte pixel stride lets the kernels issue one aligned 32-bit store per
+        # pixel; the constant alpha plane is stripped again at render time.
+        self.pixels = np.zeros((size[1], size[0], 4), dtype=np.uint8)
+        self.pixels[:, :, 3] = 255
+        # Aliased one-word-per-pixel view of the same buffer; the quadtree kernels use it to
+        # compare and store whole RGBA colors as single 32-bit ops.
+        self.pixels32 = self.pixels.view(np.uint32).reshape(size[1], size[0])
         self.color_scheme = u1.cast_python_value(color_scheme)
+
+        # Kernels specialized for the render configuration: the color scheme, smooth and
+        # period-checking flags are closure constants in the compiled code, so no per-pixel dispatch
+        # or dead branch survives compilation.
+        self.calculate_kernel = make_calculate(self.color_scheme, self.smooth, self.period_checking)
+        self.colorize_kernel = colorize_kernels.get(self.color_scheme, colorize_grayscale)
+        self.grid_kernel = make_calculate_grid(self.color_scheme, self.smooth, self.period_checking)
         self.color_mode = "RGB"
-        self.color_map = color_map if self.color_scheme == 3 else np.array([[]], dtype=np.uint8)
+
+        # The colormap scheme indexes an iteration-keyed lookup table built once here: entry k holds
+        # color_map[min(k % N, k % max_iterations)], so the kernel replaces two per-pixel modulo
+        # operations with a single table load.
+        if self.color_scheme == 3 and color_map.size:
+            k = np.arange(int(self.max_iterations) + 1)
+            n = color_map.shape[0]
+            self.color_map = np.ascontiguousarray(
+                color_map[np.minimum(k % n, k % int(self.max_iterations))], dtype=np.uint8)
+        else:
+            self.color_map = np.array([[]], dtype=np.uint8)
 
         if self.color_scheme == 1:
             self.color_mode = "HSV"
@@ -77,6 +144,7 @@ class AcceleratedMandelbrot:
 
         self.escape_radius = escape_radius
         self.escape_radius_squared = escape_radius * escape_radius
+        self.log2_log2_escape_radius = float(np.log2(np.log2(escape_radius)))
 
         self.show_quadtree = not self.raster and show_quadtree
 
@@ -84,93 +152,249 @@ class AcceleratedMandelbrot:
         self.percent_completed = 0.0
         self.width = width
 
+        self.box_pool = np.empty((0, 2, 2), dtype=np.int32)
+
+    @staticmethod
+    def split_box(tl0, tl1, br0, br1, boundary=1):
+        """
+        Splits an integer bounding box into up to four child boxes, mirroring QuadTree.split without
+        allocating Python node objects.
+
+        Parameters:
+        - tl0 (int): x-coordinate of the top-left corner.
+        - tl1 (int): y-coordinate of the top-left corner.
+        - br0 (int): x-coordinate of the bottom-right corner.
+        - br1 (int): y-coordinate of the bottom-right corner.
+        - boundary (int): Optional boundary to leave empty around each child box.
+
+        Returns:
+        - list[tuple[int, int, int, int]]: Child boxes as (tl0, tl1, br0, br1) tuples.
+        """
+        tl0 += boundary
+        tl1 += boundary
+        br0 -= boundary
+        br1 -= boundary
+
+        cols = br0 - tl0
+        rows = br1 - tl1
+
+        if rows < 1 or cols < 1:
+            raise Exception("Cannot split box.")
+
+        if rows == 1 and cols == 1:
+            return [(tl0, tl1, br0, br1)]
+
+        half_cols = cols // 2
+        half_rows = rows // 2
+
+        if rows == 1:
+            return [(tl0, tl1, tl0 + half_cols, br1),
+                    (tl0 + half_cols, tl1, br0, br1)]
+
+        if cols == 1:
+            return [(tl0, tl1, br0, tl1 + half_rows),
+                    (tl0, tl1 + half_rows, br0, br1)]
+
+        return [(tl0, tl1, tl0 + half_cols, tl1 + half_rows),
+                (tl0 + half_cols, tl1, br0, tl1 + half_rows),
+                (tl0, tl1 + half_rows, tl0 + half_cols, br1),
+                (tl0 + half_cols, tl1 + half_rows, br0, br1)]
+
+    def seed_box_pool(self):
+        """
+        Seeds the flat quadtree box pool with the four quadrants of the image.
+
+        Returns:
+        - tuple[int, int]: The [start, end) index range of the seeded level in the pool.
+        """
+        self.box_pool = np.empty((1024, 2, 2), dtype=np.int32)
+
+        end = 0
+        for child in self.split_box(0, 0, self.size[0], self.size[1], boundary=0):
+            self.box_pool[end, 0] = child[:2]
+            self.box_pool[end, 1] = child[2:]
+            end += 1
+
+        return 0, end
+
+    def append_children(self, end, boxes):
+        """
+        Splits a whole level's worth of boxes at once and appends the children to the pool.
+
+        The four candidate children of every box are built with array arithmetic and degenerate
+        (zero-width or zero-height) candidates are masked out, so no Python-level work happens per
+        node. Matches the split_box geometry, including the single- and double-child edge cases.
+
+        Parameters:
+        - end (int): Current number of boxes in the pool.
+        - boxes (numpy.ndarray): The (tl, br) boxes being split, shaped (n, 2, 2).
+
+        Returns:
+        - int: Updated number of boxes in the pool.
+        """
+        if boxes.shape[0] == 0:
+            return end
+
+        tl = boxes[:, 0] + 1
+        br = boxes[:, 1] - 1
+
+        if np.any(br - tl < 1):
+            raise Exception("Cannot split box.")
+
+        mid = np.where(br - tl > 1, tl + (br - tl) // 2, br)
+
+        candidates = np.empty((boxes.shape[0], 4, 2, 2), dtype=np.int32)
+        candidates[:, 0, 0] = tl
+        candidates[:, 0, 1] = mid
+        candidates[:, 1, 0, 0] = mid[:, 0]
+        candidates[:, 1, 0, 1] = tl[:, 1]
+        candidates[:, 1, 1, 0] = br[:, 0]
+        candidates[:, 1, 1, 1] = mid[:, 1]
+        candidates[:, 2, 0, 0] = tl[:, 0]
+        candidates[:, 2, 0, 1] = mid[:, 1]
+        candidates[:, 2, 1, 0] = mid[:, 0]
+        candidates[:, 2, 1, 1] = br[:, 1]
+        candidates[:, 3, 0] = mid
+        candidates[:, 3, 1] = br
+
+        children = candidates[(candidates[:, :, 1, 0] > candidates[:, :, 0, 0])
+                              & (candidates[:, :, 1, 1] > candidates[:, :, 0, 1])]
+
+        while end + children.shape[0] > self.box_pool.shape[0]:
+            self.box_pool = np.resize(self.box_pool, (self.box_pool.shape[0] * 2, 2, 2))
+
+        self.box_pool[end:end + children.shape[0]] = children
+
+        return end + children.shape[0]
+
+    def level_soa(self, start, end):
+        """
+        Repacks one BFS level of the box pool into four dense int32 coordinate arrays.
+
+        The kernels stream the corner coordinates as structure-of-arrays scalars, which avoids
+        constructing an (2,) view per box inside the parallel loops.
+
+        Parameters:
+        - start (int): Start index of the level in the pool.
+        - end (int): End index of the level in the pool.
+
+        Returns:
+        - tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray, numpy.ndarray]: tl_x, tl_y, br_x, br_y.
+        """
+        level = self.box_pool[start:end]
+
+        return (np.ascontiguousarray(level[:, 0, 0]), np.ascontiguousarray(level[:, 0, 1]),
+                np.ascontiguousarray(level[:, 1, 0]), np.ascontiguousarray(level[:, 1, 1]))
+
     def generate(self):
         """
         Generates the Mandelbrot fractal based on the specified configuration.
         """
         if self.raster:
-            compute_raster(self.pixels, np.zeros(shape=(1, 0), dtype=bool), self.x, self.y, self.max_iterations,
-                           self.escape_radius,
-                           self.smooth,
-                           self.color_scheme,
-                           self.color_map,
-                           self.period_checking)
+            rows = self.size[1]
+
+            if self.symmetric:
+                # The image straddles y=0, so only the upper half-plane rows need computing; the
+                # lower half is an exact mirror of the rows above it.
+                rows = (rows + 1) // 2
+
+            if self.use_cuda:
+                compute_raster_cuda(self.pixels[:rows], self.x, self.y[:rows], self.max_iterations,
+                                    self.escape_radius,
+                                    self.log2_log2_escape_radius,
+                                    self.smooth,
+                                    self.color_scheme,
+                                    self.color_map,
+                                    self.period_checking)
+            elif self.color_scheme == 3 and self.color_map.size:
+                # The colormap scheme only needs the dwell index per pixel, so the compiled kernel
+                # produces the index grid and a single NumPy fancy-index gathers the whole image
+                # from the lookup table at C level.
+                indices = np.zeros((rows, self.size[0]), dtype=np.int64)
+
+                compute_dwell_indices(indices, self.x0, self.dx, self.y[:rows], self.max_iterations,
+                                      self.escape_radius,
+                                      self.log2_log2_escape_radius,
+                                      self.smooth)
+
+                self.pixels[:rows, :, :3] = self.color_map[indices]
+            else:
+                self.grid_kernel(self.x[None, :], self.y[:rows, None], self.max_iterations,
+                                 self.escape_radius,
+                                 self.log2_log2_escape_radius,
+                                 self.color_map,
+                                 self.pixels[:rows])
+
+            if rows != self.size[1]:
+                self.pixels[rows:] = self.pixels[self.size[1] - rows - 1::-1]
         if self.mixed_raster:
             if self.fast_quadtree:
-                self.quad_tree.split(boundary=0)
-                queue: deque[QuadTree] = deque(self.quad_tree.children)
-                interval = np.array([[quad.tl, quad.br] for quad in self.quad_tree.children])
+                start, end = self.seed_box_pool()
 
                 seen = np.zeros(shape=(self.size[1], self.size[0]), dtype=bool)
+                in_set = np.zeros(shape=(self.size[1], self.size[0]), dtype=bool)
+
+                while start < end:
+                    kernel = fast_mixed_quadtree if end - start >= MIN_PARALLEL_BOXES \
+                        else fast_mixed_quadtree_serial
+                    tl_x, tl_y, br_x, br_y = self.level_soa(start, end)
+                    result_list = kernel(tl_x, tl_y, br_x, br_y, self.pixels, self.pixels32, seen, in_set,
+                                         self.x,
+                                         self.y,
+                                         self.max_iterations,
+                                         self.escape_radius,
+                                         self.log2_log2_escape_radius,
+                                         self.calculate_kernel,
+                                         self.color_map)
+
+                    level = self.box_pool[start:end]
+                    start = end
+
+                    split_mask = result_list[:, 0] != 0
+                    fill_mask = ~split_mask & (result_list[:, 1] != 0)
+
+                    for box, result in zip(level[fill_mask], result_list[fill_mask]):
+                        mark_and_fill(self.pixels32, seen, in_set, box[0] + 1, box[1] - 1, result[2])
 
-                while queue:
-                    result_list = fast_mixed_quadtree(interval, self.pixels, seen,
-                                                      self.x,
-                                                      self.y,
-                                                      self.max_iterations,
-                                                      self.escape_radius,
-                                                      self.smooth,
-                                                      self.color_scheme,
-                                                      self.color_map,
-                                                      self.period_checking)
-
-                    temp_interval = []
-
-                    for i, result in enumerate(result_list):
-                        quadtree = queue.popleft()
-                        split = result[0] != 0
-                        isMandelbrot = result[1] != 0
-                        border = result[2:]
-
-                        if split:
-                            quadtree.split()
-                            queue.extend(quadtree.children)
-                            temp_interval += [[quad.tl, quad.br] for quad in quadtree.children]
-                        elif isMandelbrot:
-                            quadtree.fill_array(self.pixels, border)
-                            quadtree.fill_array(seen, True)
-
-                    interval = np.array(temp_interval)
-
-                compute_raster(self.pixels, seen, self.x, self.y, self.max_iterations, self.escape_radius,
+                    end = self.append_children(end, level[split_mask])
+
+                self.box_pool = self.box_pool[:end]
+
+                compute_raster(self.pixels, seen, self.x0, self.dx, self.y, self.max_iterations, self.escape_radius,
+                               self.log2_log2_escape_radius,
                                self.smooth,
-                               self.color_scheme,
-                               self.color_map,
-                               self.period_checking)
+                               self.colorize_kernel,
+                               self.color_map)
             else:
                 self.mixed_quadtree()
         else:
             if self.fast_quadtree:
-                self.quad_tree.split(boundary=0)
-                queue: deque[QuadTree] = deque(self.quad_tree.children)
-                interval = np.array([[quad.tl, quad.br] for quad in self.quad_tree.children])
-
-                while queue:
-                    result_list = compute_fast_quadtree(interval, self.pixels,
-                                                        self.x,
-                                                        self.y,
-                                                        self.max_iterations,
-                                                        self.escape_radius,
-                                                        self.smooth,
-                                                        self.color_scheme,
-                                                        self.color_map,
-                                                        self.period_checking)
-
-                    temp_interval = []
-
-                    for i, result in enumerate(result_list):
-                        quadtree = queue.popleft()
-                        split = result[0] != 0
-                        border = result[1:]
-
-                        if split:
-                            quadtree.split()
-                            queue.extend(quadtree.children)
-                            temp_interval += [[quad.tl, quad.br] for quad in quadtree.children]
-                        else:
-                            quadtree.fill_array(self.pixels, border)
-
-                    interval = np.array(temp_interval)
+                start, end = self.seed_box_pool()
+
+                while start < end:
+                    kernel = compute_fast_quadtree if end - start >= MIN_PARALLEL_BOXES \
+                        else compute_fast_quadtree_serial
+                    tl_x, tl_y, br_x, br_y = self.level_soa(start, end)
+                    result_list = kernel(tl_x, tl_y, br_x, br_y, self.pixels, self.pixels32,
+                                         self.x,
+                                         self.y,
+                                         self.max_iterations,
+                                         self.escape_radius,
+                                         self.log2_log2_escape_radius,
+                                         self.calculate_kernel,
+                                         self.color_map)
+
+                    level = self.box_pool[start:end]
+                    start = end
+
+                    split_mask = result_list[:, 0] != 0
+
+                    for box, result in zip(level[~split_mask], result_list[~split_mask]):
+                        self.pixels32[box[0, 1] + 1:box[1, 1] - 1, box[0, 0] + 1:box[1, 0] - 1] = result[1]
+
+                    end = self.append_children(end, level[split_mask])
+
+                self.box_pool = self.box_pool[:end]
             else:
                 self.normal_quadtree()
 
@@ -178,70 +402,77 @@ class AcceleratedMandelbrot:
         """
         Generates the Mandelbrot fractal using normal quadtree computation.
         """
-        self.quad_tree.split(boundary=0)
-        queue: deque[QuadTree] = deque(self.quad_tree.children)
-
-        while queue:
-            quad_tree = queue.popleft()
-
-            result = calculate_quadtree(quad_tree.tl, quad_tree.br, self.pixels,
-                                        self.x,
-                                        self.y,
-                                        self.max_iterations,
-                                        self.escape_radius,
-                                        self.smooth,
-                                        self.color_scheme,
-                                        self.color_map,
-                                        self.period_checking)
-
-            split = result[0] != 0
-            border = result[1:]
-
-            if split:
-                quad_tree.split()
-                queue.extend(quad_tree.children)
-            else:
-                quad_tree.fill_array(self.pixels, border)
+        start, end = self.seed_box_pool()
+
+        while start < end:
+            level = self.box_pool[start:end]
+            result_list = np.empty((level.shape[0], 2), dtype=np.uint32)
+
+            for i, box in enumerate(level):
+                result_list[i] = calculate_quadtree(box[0, 0], box[0, 1], box[1, 0], box[1, 1], self.pixels,
+                                                    self.pixels32,
+                                                    self.x,
+                                                    self.y,
+                                                    self.max_iterations,
+                                                    self.escape_radius,
+                                                    self.log2_log2_escape_radius,
+                                                    self.calculate_kernel,
+                                                    self.color_map)
+
+            start = end
+
+            split_mask = result_list[:, 0] != 0
+
+            for box, result in zip(level[~split_mask], result_list[~split_mask]):
+                self.pixels32[box[0, 1] + 1:box[1, 1] - 1, box[0, 0] + 1:box[1, 0] - 1] = result[1]
+
+            end = self.append_children(end, level[split_mask])
+
+        self.box_pool = self.box_pool[:end]
 
     def mixed_quadtree(self):
         """
         Generates the Mandelbrot fractal using mixed quadtree computation.
         """
 
-        self.quad_tree.split(boundary=0)
-        queue: deque[QuadTree] = deque(self.quad_tree.children)
+        start, end = self.seed_box_pool()
 
         seen = np.zeros(shape=(self.size[1], self.size[0]), dtype=bool)
+        in_set = np.zeros(shape=(self.size[1], self.size[0]), dtype=bool)
 
-        while queue:
-            quad_tree = queue.popleft()
-
-            result = calculate_mixed(quad_tree.tl, quad_tree.br, self.pixels, seen,
-                                     self.x,
-                                     self.y,
-                                     self.max_iterations,
-                                     self.escape_radius,
-                                     self.smooth,
-                                     self.color_scheme,
-                                     self.color_map,
-                                     self.period_checking)
-
-            split = result[0] != 0
-            isMandelbrot = result[1] != 0
-            border = result[2:]
-
-            if split:
-                quad_tree.split()
-                queue.extend(quad_tree.children)
-            elif isMandelbrot:
-                quad_tree.fill_array(self.pixels, border)
-                quad_tree.fill_array(seen, True)
-
-        compute_raster(self.pixels, seen, self.x, self.y, self.max_iterations, self.escape_radius,
+        while start < end:
+            level = self.box_pool[start:end]
+            result_list = np.empty((level.shape[0], 3), dtype=np.uint32)
+
+            for i, box in enumerate(level):
+                result_list[i] = calculate_mixed(box[0, 0], box[0, 1], box[1, 0], box[1, 1], self.pixels,
+                                                 self.pixels32, seen,
+                                                 in_set,
+                                                 self.x,
+                                                 self.y,
+                                                 self.max_iterations,
+                                                 self.escape_radius,
+                                                 self.log2_log2_escape_radius,
+                                                 self.calculate_kernel,
+                                                 self.color_map)
+
+            start = end
+
+            split_mask = result_list[:, 0] != 0
+            fill_mask = ~split_mask & (result_list[:, 1] != 0)
+
+            for box, result in zip(level[fill_mask], result_list[fill_mask]):
+                mark_and_fill(self.pixels32, seen, in_set, box[0] + 1, box[1] - 1, result[2])
+
+            end = self.append_children(end, level[split_mask])
+
+        self.box_pool = self.box_pool[:end]
+
+        compute_raster(self.pixels, seen, self.x0, self.dx, self.y, self.max_iterations, self.escape_radius,
+                       self.log2_log2_escape_radius,
                        self.smooth,
-                       self.color_scheme,
-                       self.color_map,
-                       self.period_checking)
+                       self.colorize_kernel,
+                       self.color_map)
 
     def render(self, filename="image.png"):
         """
@@ -250,7 +481,11 @@ class AcceleratedMandelbrot:
         Parameters:
         - filename (str): Output file name.
         """
-        img = Image.fromarray(self.pixels, mode=self.color_mode).convert('RGB')
+        if self.color_mode == "HSV":
+            hsv_to_rgb(self.pixels)
+            self.color_mode = "RGB"
+
+        img = Image.fromarray(np.ascontiguousarray(self.pixels[..., :3]), mode="RGB")
 
         if self.show_quadtree:
             self.draw_quadtree(img)
@@ -261,16 +496,15 @@ class AcceleratedMandelbrot:
         """
         Draws quadtree boundaries on the output image.
 
+        The box pool already holds every box the BFS visited, so no tree objects or traversal are
+        needed; only the image outline is drawn separately.
+
         Parameters:
         - img (Image): Image object to draw quadtree boundaries on.
         """
 
         draw = ImageDraw.Draw(img)
-        queue: deque[QuadTree] = deque([self.quad_tree])
-
-        while queue:
-            quad_tree = queue.popleft()
-            draw.rectangle(((quad_tree.tl[0], quad_tree.tl[1]), (quad_tree.br[0], quad_tree.br[1])), outline="red")
+        draw.rectangle(((0, 0), (self.size[0], self.size[1])), outline="red")
 
-            for child in quad_tree.children:
-                queue.append(child)
+        for tl, br in self.box_pool.tolist():
+            draw.rectangle(((tl[0], tl[1]), (br[0], br[1])), outline="red")
@@ -1,14 +1,19 @@
 import numpy as np
-from numba import njit, f8, i4, u8, b1, u1
+from numba import njit, guvectorize, f4, f8, u8, u1
 
-from .coloring import grayscale, simple_hsv, quilt_coloring, colormap_coloring
+from .coloring import grayscale, simple_hsv, quilt_coloring, colormap_coloring, FASTMATH_FLAGS
 
 
-@njit(fastmath=True)
+@njit(inline='always', fastmath=FASTMATH_FLAGS)
 def in_main_body(x, y):
     """
     Checks if the given coordinates (x, y) are inside the main cardioid or period-2 bulb of the Mandelbrot set.
 
+    The body is a single straight-line expression: hoisting dx = x - 0.25 and combining the two
+    region tests with a bitwise or keeps it branchless, so LLVM can fuse the multiply-adds into
+    FMA instructions and the per-pixel call inlines into the callers without a short-circuit
+    branch in the hot loop.
+
     Parameters:
     - x (float): The x-coordinate in the complex plane.
     - y (float): The y-coordinate in the complex plane.
@@ -17,172 +22,215 @@ def in_main_body(x, y):
     - bool: True if inside the main cardioid or period-2 bulb, False otherwise.
     """
 
-    q = (x - 0.25) * (x - 0.25) + y * y
-    return q * (q + x - 0.25) <= 0.25 * y * y
+    dx = x - 0.25
+    y2 = y * y
+    q = dx * dx + y2
+
+    return (q * (q + dx) <= 0.25 * y2) | ((x + 1.0) * (x + 1.0) + y2 <= 0.0625)
 
 
-@njit(u1[:](u8, i4, f8, f8, f8, f8, b1, u1, u1[:, :]), fastmath=True)
-def determine_colorscheme(max_iteration: int,
-                          iteration: int,
-                          distance_estimate: float,
-                          x,
-                          y,
-                          escape_radius: float,
-                          smooth: bool,
-                          color_scheme: int,
-                          color_map):
+@njit(fastmath=FASTMATH_FLAGS)
+def colorize_grayscale(max_iteration, iteration, distance_estimate, x, y, log2_log2_escape_radius, smooth,
+                       color_map, out):
     """
-    Determines the color for a pixel based on the specified color scheme.
+    Grayscale colorizer with the shared colorizer signature.
+    """
+    grayscale(max_iteration, iteration, x, y, log2_log2_escape_radius, smooth, out)
 
-    Parameters:
-    - max_iteration (int): The maximum number of iterations.
-    - iteration (int): The current iteration count.
-    - distance_estimate (float): The distance estimate from the Mandelbrot set.
-    - x (float): The x-coordinate in the complex plane.
-    - y (float): The y-coordinate in the complex plane.
-    - escape_radius (float): The escape radius for the Mandelbrot set.
-    - smooth (bool): Flag indicating whether to use smooth coloring.
-    - color_scheme (int): Identifier for the color scheme.
-    - color_map (numpy.ndarray): Color map for mapping fractal values to colors.
 
-    Returns:
-    - numpy.ndarray: An array representing the color for the pixel.
+@njit(fastmath=FASTMATH_FLAGS)
+def colorize_hsv(max_iteration, iteration, distance_estimate, x, y, log2_log2_escape_radius, smooth,
+                 color_map, out):
+    """
+    Simple HSV colorizer with the shared colorizer signature.
     """
+    simple_hsv(max_iteration, iteration, x, y, log2_log2_escape_radius, smooth, out)
+
 
-    if color_scheme == 0:
-        return grayscale(max_iteration,
-                         iteration,
-                         x,
-                         y,
-                         escape_radius,
-                         smooth)
-    elif color_scheme == 1:
-        return simple_hsv(max_iteration,
-                          iteration,
-                          x,
-                          y,
-                          escape_radius,
-                          smooth)
-    elif color_scheme == 2:
-        return quilt_coloring(max_iteration,
-                              iteration,
-                              x, y,
-                              escape_radius,
-                              distance_estimate,
-                              smooth, )
-    elif color_scheme == 3:
-        return colormap_coloring(max_iteration,
-                                 iteration,
-                                 x,
-                                 y,
-                                 escape_radius,
-                                 smooth,
-                                 color_map)
-    else:
-        return grayscale(max_iteration,
-                         iteration,
-                         x, y,
-                         escape_radius,
-                         smooth)
-
-
-@njit(u1[:](f8, f8, u8, f8, b1, u1, u1[:, :], b1), fastmath=True)
-def calculate(x0: float,
-              y0: float,
-              max_iterations: int,
-              escape_radius: float,
-              smooth: bool,
-              color_scheme: int,
-              color_map,
-              period_checking: bool):
+@njit(fastmath=FASTMATH_FLAGS)
+def colorize_quilt(max_iteration, iteration, distance_estimate, x, y, log2_log2_escape_radius, smooth,
+                   color_map, out):
     """
-    Calculates the Mandelbrot fractal value for a given point in the complex plane.
+    Quilt colorizer with the shared colorizer signature.
+    """
+    quilt_coloring(max_iteration, iteration, x, y, log2_log2_escape_radius, distance_estimate, smooth, out)
+
+
+@njit(fastmath=FASTMATH_FLAGS)
+def colorize_cmap(max_iteration, iteration, distance_estimate, x, y, log2_log2_escape_radius, smooth,
+                  color_map, out):
+    """
+    Colormap colorizer with the shared colorizer signature.
+    """
+    colormap_coloring(max_iteration, iteration, x, y, log2_log2_escape_radius, smooth, color_map, out)
+
+
+colorize_kernels = {1: colorize_hsv, 2: colorize_quilt, 3: colorize_cmap}
+
+
+_point_kernels = {}
+
+
+def make_calculate(color_scheme, smooth, period_checking):
+    """
+    Builds (and caches) a point kernel specialized for one render configuration.
+
+    The colorizer, smooth flag and period-checking flag are bound as closure constants, so the
+    compiled kernel carries no per-pixel color scheme dispatch and Numba prunes the smooth and
+    period-checking branches at compile time. (numba removed generated_jit; closure factories are
+    the supported way to get the same per-configuration specialization.) max_iterations stays a
+    runtime argument — one compiled variant per iteration budget would not pay for itself.
 
     Parameters:
-    - x0 (float): The x-coordinate of the point in the complex plane.
-    - y0 (float): The y-coordinate of the point in the complex plane.
-    - max_iterations (int): The maximum number of iterations.
-    - escape_radius (float): The escape radius for the Mandelbrot set.
-    - smooth (bool): Flag indicating whether to use smooth coloring.
     - color_scheme (int): Identifier for the color scheme.
-    - color_map (numpy.ndarray): Color map for mapping fractal values to colors.
-    - period_checking (bool): Flag indicating whether to perform period checking.
+    - smooth (bool): Whether smooth coloring is enabled.
+    - period_checking (bool): Whether to perform period checking.
 
     Returns:
-    - numpy.ndarray: An array representing the color value for the pixel.
+    - A compiled calculate(x0, y0, max_iterations, escape_radius, log2_log2_escape_radius,
+      color_map, out) kernel.
     """
 
-    if in_main_body(x0, y0):
-        color = determine_colorscheme(max_iteration=max_iterations, iteration=max_iterations,
-                                      distance_estimate=0.0, x=x0, y=y0, escape_radius=escape_radius,
-                                      smooth=smooth, color_scheme=color_scheme, color_map=color_map)
+    key = (color_scheme, bool(smooth), bool(period_checking))
+
+    if key in _point_kernels:
+        return _point_kernels[key]
+
+    colorize = colorize_kernels.get(color_scheme, colorize_grayscale)
 
-        return np.array([1, color[0], color[1], color[2]], dtype=np.uint8)
+    @njit(fastmath=FASTMATH_FLAGS)
+    def calculate(x0, y0, max_iterations, escape_radius, log2_log2_escape_radius, color_map, out):
+        """
+        Calculates the Mandelbrot fractal value for a given point in the complex plane.
 
-    x = 0
-    y = 0
-    x2 = 0
-    y2 = 0
-    w = 0
+        The color is written into the caller-provided output slice (typically the pixel buffer itself)
+        instead of returning a fresh per-pixel array.
 
-    x_old = 0
-    y_old = 0
-    period = 0
+        Parameters:
+        - x0 (float): The x-coordinate of the point in the complex plane.
+        - y0 (float): The y-coordinate of the point in the complex plane.
+        - max_iterations (int): The maximum number of iterations.
+        - escape_radius (float): The escape radius for the Mandelbrot set.
+        - log2_log2_escape_radius (float): Precomputed log2(log2(escape_radius)) for the render.
+        - color_map (numpy.ndarray): Color map for mapping fractal values to colors.
+        - out (numpy.ndarray): Output slice the color is written into.
 
-    dx = 0
-    dy = 0
+        Returns:
+        - int: 1 if the point reached the maximum iteration count (in the set), 0 otherwise.
+        """
 
-    iterations = 0
+        if in_main_body(x0, y0):
+            colorize(max_iterations, max_iterations, 0.0, x0, y0, log2_log2_escape_radius, smooth,
+                     color_map, out)
 
-    escape_radius_squared = escape_radius * escape_radius
+            return 1
 
-    for i in range(max_iterations):
-        x = x2 - y2 + x0
-        y = w - x2 - y2 + y0
-        x2 = x * x
-        y2 = y * y
-        w = (x + y) * (x + y)
+        x = 0
+        y = 0
+        x2 = 0
+        y2 = 0
+        w = 0
 
-        dx2 = 2 * (x * dx - y * dy) + 1
-        dy = 2 * (y * dx + x * dy)
-        dx = dx2
+        # Brent's cycle detection state: the saved point trails the orbit at doubling
+        # intervals, so any cycle of length <= power is caught with one compare per
+        # iteration and no history buffer.
+        x_old = 0.0
+        y_old = 0.0
+        power = 1
+        lam = 1
 
-        iterations += 1
+        dx = 0
+        dy = 0
 
-        if x2 + y2 >= escape_radius_squared:
-            break
+        iterations = 0
 
-        if period_checking:
-            if x_old == x and y_old == y:
-                iterations = max_iterations
+        escape_radius_squared = escape_radius * escape_radius
+
+        for i in range(max_iterations):
+            x = x2 - y2 + x0
+            y = w - x2 - y2 + y0
+            x2 = x * x
+            y2 = y * y
+            w = (x + y) * (x + y)
+
+            dx2 = 2 * (x * dx - y * dy) + 1
+            dy = 2 * (y * dx + x * dy)
+            dx = dx2
+
+            iterations += 1
+
+            if x2 + y2 >= escape_radius_squared:
                 break
-            period += 1
 
-            if period > period_checking:
-                period = 0
-                x_old = x
-                y_old = y
+            if period_checking:
+                if abs(x - x_old) + abs(y - y_old) < 1e-15:
+                    iterations = max_iterations
+                    break
+
+                if lam == power:
+                    power *= 2
+                    lam = 0
+                    x_old = x
+                    y_old = y
+
+                lam += 1
+
+        z = x2 + y2
+        dz = dx * dx + dy * dy
+
+        distance_estimate = 0.0
+
+        if iterations != max_iterations:
+            distance_estimate = np.log(z) * np.sqrt(z / dz)
+
+        colorize(max_iterations, iterations, distance_estimate, x, y, log2_log2_escape_radius, smooth,
+                 color_map, out)
+
+        if iterations == max_iterations:
+            return 1
+
+        return 0
+
+    _point_kernels[key] = calculate
 
-    z = x2 + y2
-    dz = dx * dx + dy * dy
+    return calculate
+
+
+_grid_kernels = {}
+
+
+def make_calculate_grid(color_scheme, smooth, period_checking):
+    """
+    Builds (and caches) the broadcast grid kernel for one render configuration.
+
+    Each grid kernel closes over the matching specialized point kernel, so the gufunc body is a
+    direct call with no per-pixel dispatch. Writes the color for each (x0, y0) pair into a
+    caller-provided pixel slice, which lets Numba thread over rows and avoids per-pixel allocations.
+
+    Parameters:
+    - color_scheme (int): Identifier for the color scheme.
+    - smooth (bool): Whether smooth coloring is enabled.
+    - period_checking (bool): Whether to perform period checking.
+
+    Returns:
+    - The compiled guvectorize kernel for the configuration.
+    """
 
-    distance_estimate = 0.0
+    key = (color_scheme, bool(smooth), bool(period_checking))
 
-    if iterations != max_iterations:
-        distance_estimate = np.log(z) * np.sqrt(z / dz)
+    if key in _grid_kernels:
+        return _grid_kernels[key]
 
-    color = determine_colorscheme(max_iteration=max_iterations,
-                                  iteration=iterations,
-                                  distance_estimate=distance_estimate,
-                                  x=x, y=y,
-                                  escape_radius=escape_radius,
-                                  smooth=smooth,
-                                  color_scheme=color_scheme,
-                                  color_map=color_map)
+    calculate = make_calculate(color_scheme, smooth, period_checking)
 
-    isMaxIteration = 0
+    @guvectorize([(f4, f4, u8, f8, f8, u1[:, :], u1[:], u1[:]),
+                  (f8, f8, u8, f8, f8, u1[:, :], u1[:], u1[:])],
+                 '(),(),(),(),(),(m,k),(n)->()', target='parallel', nopython=True)
+    def calculate_grid(x0, y0, max_iterations, escape_radius, log2_log2_escape_radius,
+                       color_map, out, is_max_iteration):
+        is_max_iteration[0] = calculate(x0, y0, max_iterations, escape_radius, log2_log2_escape_radius,
+                                        color_map, out)
 
-    if iterations == max_iterations:
-        isMaxIteration = 1
+    _grid_kernels[key] = calculate_grid
 
-    return np.array([isMaxIteration, color[0], color[1], color[2]], dtype=np.uint8)
+    return calculate_grid
@@ -1,9 +1,16 @@
 import numpy as np
-from numba import njit, float64, int32, b1, u1
+from numba import njit, float64, int32, b1, u1, void, prange
 
+INV_LOG_100000 = 1.0 / np.log(100000.0)
 
-@njit(float64(float64, float64, int32, float64), fastmath=True)
-def continous_dwell(x: float, y: float, dwell: int, escape_radus: float) -> float:
+# Everything except 'reassoc': contraction (FMA), reciprocal and no-NaN/Inf assumptions are safe
+# wins here, but reassociation may rewrite the loop-carried iteration chain in ways that change
+# boundary colors and can lengthen the dependency chain.
+FASTMATH_FLAGS = {'nnan', 'ninf', 'nsz', 'arcp', 'contract', 'afn'}
+
+
+@njit(float64(float64, float64, int32, float64), fastmath=FASTMATH_FLAGS)
+def continous_dwell(x: float, y: float, dwell: int, log2_log2_escape_radius: float) -> float:
     """
         Calculate continuous dwell value for smooth coloring.
 
@@ -11,56 +18,67 @@ def continous_dwell(x: float, y: float, dwell: int, escape_radus: float) -> floa
         - x (float): Real component of the complex number.
         - y (float): Imaginary component of the complex number.
         - dwell (int): Iteration count.
-        - escape_radus (float): Escape radius for the fractal.
+        - log2_log2_escape_radius (float): Precomputed log2(log2(escape_radius)) for the render.
 
         Returns:
         - float: Continuous dwell value.
         """
-    return dwell - np.log2(np.log2(x * x + y * y)) + np.log2(np.log2(escape_radus)) + 1
+    return dwell - np.log2(np.log2(x * x + y * y)) + log2_log2_escape_radius + 1
 
 
-@njit(u1[:](int32, int32, float64, float64, float64, b1, u1[:, :]), fastmath=True)
+@njit(void(int32, int32, float64, float64, float64, b1, u1[:, :], u1[:]), fastmath=FASTMATH_FLAGS)
 def colormap_coloring(max_iteration,
                       iteration,
                       final_x,
                       final_y,
-                      escape_radius,
+                      log2_log2_escape_radius,
                       smooth,
-                      color_map):
+                      color_map,
+                      out):
     """
         Apply colormap coloring to determine the RGB color for a pixel.
 
+        The color map is an iteration-indexed lookup table prepared at setup time, so the per-pixel
+        cost is a single contiguous load instead of two modulo operations; indices outside the table
+        (possible only for extreme smooth dwell values) clamp to its ends.
+
         Parameters:
         - max_iteration (int): Maximum number of iterations.
         - iteration (int): Current iteration count.
         - final_x (float): Final x-coordinate in the complex plane.
         - final_y (float): Final y-coordinate in the complex plane.
-        - escape_radius (float): Escape radius for the fractal.
+        - log2_log2_escape_radius (float): Precomputed log2(log2(escape_radius)) for the render.
         - smooth (bool): Flag indicating whether to use smooth coloring.
-        - color_map (numpy.ndarray): Color map for mapping fractal values to colors.
+        - color_map (numpy.ndarray): Iteration-indexed (max_iteration + 1, 3) color lookup table.
+        - out (numpy.ndarray): Output slice the RGB color is written into.
 
         Returns:
-        - numpy.ndarray: RGB color for the pixel.
+        - None
     """
 
     i = iteration
     if iteration != max_iteration and smooth != 0:
-        i = continous_dwell(final_x, final_y, iteration, escape_radius)
-
-    N = color_map.shape[0]
+        i = int(np.floor(continous_dwell(final_x, final_y, iteration, log2_log2_escape_radius)))
 
-    i = int(min(np.mod(i, N), np.mod(i, max_iteration)))
+    if i < 0:
+        i = 0
+    elif i >= color_map.shape[0]:
+        i = color_map.shape[0] - 1
 
-    return color_map[i]  # Ensure consistent data type
+    out[0] = color_map[i, 0]
+    out[1] = color_map[i, 1]
+    out[2] = color_map[i, 2]
+    out[3] = 255
 
 
-@njit(u1[:](int32, int32, float64, float64, float64, b1), fastmath=True)
+@njit(void(int32, int32, float64, float64, float64, b1, u1[:]), fastmath=FASTMATH_FLAGS)
 def simple_hsv(max_iteration,
                iteration,
                final_x,
                final_y,
-               escape_radius,
-               smooth):
+               log2_log2_escape_radius,
+               smooth,
+               out):
     """
     Apply simple HSV coloring to determine the HSV color for a pixel.
 
@@ -69,33 +87,39 @@ def simple_hsv(max_iteration,
     - iteration (int): Current iteration count.
     - final_x (float): Final x-coordinate in the complex plane.
     - final_y (float): Final y-coordinate in the complex plane.
-    - escape_radius (float): Escape radius for the fractal.
+    - log2_log2_escape_radius (float): Precomputed log2(log2(escape_radius)) for the render.
     - smooth (bool): Flag indicating whether to use smooth coloring.
+    - out (numpy.ndarray): Output slice the HSV color is written into.
 
     Returns:
-    - numpy.ndarray: RGB color for the pixel.
+    - None
     """
 
     i = iteration
     if smooth != 0 and iteration != max_iteration:
-        i = continous_dwell(final_x, final_y, iteration, escape_radius)
+        i = continous_dwell(final_x, final_y, iteration, log2_log2_escape_radius)
 
     hue = 255
     value = 0
     if iteration != max_iteration:
-        hue = np.round(np.power(i / max_iteration * 255, 2)) % 255
+        scale = 255.0 * 255.0 / (max_iteration * max_iteration)
+        hue = int(i * i * scale) % 255
         value = 255
 
-    return np.array([hue, 255, value], dtype=np.uint8)  # Ensure consistent data type
+    out[0] = np.uint8(hue)
+    out[1] = 255
+    out[2] = np.uint8(value)
+    out[3] = 255
 
 
-@njit(u1[:](int32, int32, float64, float64, float64, b1), fastmath=True)
+@njit(void(int32, int32, float64, float64, float64, b1, u1[:]), fastmath=FASTMATH_FLAGS)
 def grayscale(max_iteration,
               iteration: int,
               final_x,
               final_y,
-              escape_radius: float,
-              smooth: bool):
+              log2_log2_escape_radius: float,
+              smooth: bool,
+              out):
     """
     Apply grayscale coloring to determine the RGB color for a pixel.
 
@@ -104,29 +128,36 @@ def grayscale(max_iteration,
     - iteration (int): Current iteration count.
     - final_x (float): Final x-coordinate in the complex plane.
     - final_y (float): Final y-coordinate in the complex plane.
-    - escape_radius (float): Escape radius for the fractal.
+    - log2_log2_escape_radius (float): Precomputed log2(log2(escape_radius)) for the render.
     - smooth (bool): Flag indicating whether to use smooth coloring.
+    - out (numpy.ndarray): Output slice the RGB color is written into.
 
     Returns:
-    - numpy.ndarray: RGB color for the pixel.
+    - None
     """
 
     if iteration != max_iteration and smooth:
-        iteration = continous_dwell(final_x, final_y, iteration, escape_radius)
+        iteration = continous_dwell(final_x, final_y, iteration, log2_log2_escape_radius)
 
     s = np.sqrt(iteration / max_iteration)
 
-    return np.array([s * 255, s * 255, s * 255], dtype=np.uint8)  # Ensure consistent data type
+    gray = np.uint8(s * 255)
 
+    out[0] = gray
+    out[1] = gray
+    out[2] = gray
+    out[3] = 255
 
-@njit(u1[:](int32, int32, float64, float64, float64, float64, b1), fastmath=True)
+
+@njit(void(int32, int32, float64, float64, float64, float64, b1, u1[:]), fastmath=FASTMATH_FLAGS)
 def quilt_coloring(max_iteration,
                    iteration,
                    final_x,
                    final_y,
-                   escape_radius,
+                   log2_log2_escape_radius,
                    distance_estimate,
-                   smooth):
+                   smooth,
+                   out):
     """
     Apply quilt coloring to determine the HSV color for a pixel.
 
@@ -135,16 +166,15 @@ def quilt_coloring(max_iteration,
     - iteration (int): Current iteration count.
     - final_x (float): Final x-coordinate in the complex plane.
     - final_y (float): Final y-coordinate in the complex plane.
-    - escape_radius (float): Escape radius for the fractal.
+    - log2_log2_escape_radius (float): Precomputed log2(log2(escape_radius)) for the render.
     - distance_estimate (float): Distance estimate from the Mandelbrot set.
     - smooth (bool): Flag indicating whether to use smooth coloring.
+    - out (numpy.ndarray): Output slice the HSV color is written into.
 
     Returns:
-    - numpy.ndarray: RGB color for the pixel.
+    - None
     """
 
-    color = np.array([255, 255, 0], dtype=np.uint8)
-
     if max_iteration != iteration:
         x = final_x
         y = final_y
@@ -153,7 +183,7 @@ def quilt_coloring(max_iteration,
 
         fin_radius = 0.0
         if smooth != 0:
-            fin_radius = continous_dwell(x, y, iteration, escape_radius) - iteration
+            fin_radius = continous_dwell(x, y, iteration, log2_log2_escape_radius) - iteration
 
         dscale = np.log(distance_estimate / 0.00001)
 
@@ -164,7 +194,7 @@ def quilt_coloring(max_iteration,
         else:
             value = 0
 
-        p = np.log(iteration) / np.log(100000)
+        p = np.log(iteration) * INV_LOG_100000
 
         if p < 0.5:
             p = 1.0 - 1.5 * p
@@ -189,6 +219,58 @@ def quilt_coloring(max_iteration,
 
         saturation = radius - np.floor(radius)
 
-        color = np.round(np.array([hue * 255, saturation * 255, value * 255], dtype=np.float64)).astype(
-            np.uint8)
-    return color
+        out[0] = np.uint8(np.round(hue * 255))
+        out[1] = np.uint8(np.round(saturation * 255))
+        out[2] = np.uint8(np.round(value * 255))
+        out[3] = 255
+    else:
+        out[0] = 255
+        out[1] = 255
+        out[2] = 0
+        out[3] = 255
+
+
+@njit(void(u1[:, :, :]), parallel=True, fastmath=True, nogil=True)
+def hsv_to_rgb(pixels):
+    """
+    Convert an HSV uint8 image buffer to RGB in place.
+
+    Uses the standard 6-sector formula with all threads working on their own rows, replacing PIL's
+    single-threaded per-pixel conversion at save time. The alpha plane is left untouched.
+
+    Parameters:
+    - pixels (numpy.ndarray): (H, W, 4) HSV image buffer, overwritten with RGB.
+
+    Returns:
+    - None
+    """
+
+    for j in prange(pixels.shape[0]):
+        for i in range(pixels.shape[1]):
+            h = pixels[j, i, 0] * (6.0 / 256.0)
+            s = pixels[j, i, 1] / 255.0
+            v = pixels[j, i, 2] / 255.0
+
+            sector = int(h)
+            f = h - sector
+
+            p = v * (1.0 - s)
+            q = v * (1.0 - s * f)
+            t = v * (1.0 - s * (1.0 - f))
+
+            if sector == 0:
+                r, g, b = v, t, p
+            elif sector == 1:
+                r, g, b = q, v, p
+            elif sector == 2:
+                r, g, b = p, v, t
+            elif sector == 3:
+                r, g, b = p, q, v
+            elif sector == 4:
+                r, g, b = t, p, v
+            else:
+                r, g, b = v, p, q
+
+            pixels[j, i, 0] = np.uint8(r * 255.0 + 0.5)
+            pixels[j, i, 1] = np.uint8(g * 255.0 + 0.5)
+            pixels[j, i, 2] = np.uint8(b * 255.0 + 0.5)
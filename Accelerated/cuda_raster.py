@@ -0,0 +1,240 @@
+import math
+
+import numpy as np
+from numba import cuda
+
+INV_LOG_100000 = 1.0 / math.log(100000.0)
+
+
+@cuda.jit(device=True)
+def in_main_body_cuda(x, y):
+    """
+    Device-side main cardioid / period-2 bulb test.
+    """
+
+    if (x + 1.0) * (x + 1.0) + y * y <= 0.0625:
+        return True
+
+    q = (x - 0.25) * (x - 0.25) + y * y
+    return q * (q + x - 0.25) <= 0.25 * y * y
+
+
+@cuda.jit(device=True)
+def continous_dwell_cuda(x, y, dwell, log2_log2_escape_radius):
+    """
+    Device-side continuous dwell value for smooth coloring.
+    """
+    return dwell - math.log2(math.log2(x * x + y * y)) + log2_log2_escape_radius + 1
+
+
+@cuda.jit(device=True)
+def determine_colorscheme_cuda(max_iteration, iteration, distance_estimate, x, y,
+                               log2_log2_escape_radius, smooth, color_scheme, color_map, pixels, j, i):
+    """
+    Device-side colorizer writing the pixel at (j, i) for the requested color scheme.
+
+    Mirrors the CPU colorizers; the scheme branch is uniform across the whole launch, so it does
+    not cause warp divergence.
+    """
+
+    if color_scheme == 1:
+        it = float(iteration)
+        if smooth and iteration != max_iteration:
+            it = continous_dwell_cuda(x, y, iteration, log2_log2_escape_radius)
+
+        hue = 255
+        value = 0
+        if iteration != max_iteration:
+            scale = 255.0 * 255.0 / (max_iteration * max_iteration)
+            hue = int(it * it * scale) % 255
+            value = 255
+
+        pixels[j, i, 0] = np.uint8(hue)
+        pixels[j, i, 1] = 255
+        pixels[j, i, 2] = np.uint8(value)
+        pixels[j, i, 3] = 255
+    elif color_scheme == 2:
+        if max_iteration != iteration:
+            fin_angle = math.atan2(y, x)
+
+            fin_radius = 0.0
+            if smooth:
+                fin_radius = continous_dwell_cuda(x, y, iteration, log2_log2_escape_radius) - iteration
+
+            dscale = math.log(distance_estimate / 0.00001)
+
+            if dscale > 0:
+                value = 1.0
+            elif dscale > -8:
+                value = (8 + dscale) / 8
+            else:
+                value = 0.0
+
+            p = math.log(float(iteration)) * INV_LOG_100000
+
+            if p < 0.5:
+                p = 1.0 - 1.5 * p
+                angle = 1 - p
+                radius = math.sqrt(p)
+            else:
+                p = 1.5 * p - 0.5
+                angle = p
+                radius = math.sqrt(p)
+
+            if iteration % 2 == 0:
+                value = 0.85 * value
+                radius = 0.667 * radius
+
+            if fin_angle < 0:
+                angle += 0.02
+
+            angle += 0.0001 * fin_radius
+
+            hue = angle * 10.0
+            hue = hue - math.floor(hue)
+
+            saturation = radius - math.floor(radius)
+
+            pixels[j, i, 0] = np.uint8(round(hue * 255))
+            pixels[j, i, 1] = np.uint8(round(saturation * 255))
+            pixels[j, i, 2] = np.uint8(round(value * 255))
+            pixels[j, i, 3] = 255
+        else:
+            pixels[j, i, 0] = 255
+            pixels[j, i, 1] = 255
+            pixels[j, i, 2] = 0
+            pixels[j, i, 3] = 255
+    elif color_scheme == 3:
+        k = iteration
+        if iteration != max_iteration and smooth:
+            k = int(math.floor(continous_dwell_cuda(x, y, iteration, log2_log2_escape_radius)))
+
+        if k < 0:
+            k = 0
+        elif k >= color_map.shape[0]:
+            k = color_map.shape[0] - 1
+
+        pixels[j, i, 0] = color_map[k, 0]
+        pixels[j, i, 1] = color_map[k, 1]
+        pixels[j, i, 2] = color_map[k, 2]
+        pixels[j, i, 3] = 255
+    else:
+        it = float(iteration)
+        if iteration != max_iteration and smooth:
+            it = continous_dwell_cuda(x, y, iteration, log2_log2_escape_radius)
+
+        gray = np.uint8(math.sqrt(it / max_iteration) * 255)
+
+        pixels[j, i, 0] = gray
+        pixels[j, i, 1] = gray
+        pixels[j, i, 2] = gray
+        pixels[j, i, 3] = 255
+
+
+@cuda.jit
+def raster_cuda(pixels, x, y, max_iterations, escape_radius_squared, log2_log2_escape_radius, smooth,
+                color_scheme, color_map, period_checking):
+    """
+    One thread per pixel: iterate the Mandelbrot recurrence and color the result in place.
+    """
+
+    i, j = cuda.grid(2)
+
+    if i >= x.shape[0] or j >= y.shape[0]:
+        return
+
+    x0 = x[i]
+    y0 = y[j]
+
+    if in_main_body_cuda(x0, y0):
+        determine_colorscheme_cuda(max_iterations, max_iterations, 0.0, x0, y0,
+                                   log2_log2_escape_radius, smooth, color_scheme, color_map,
+                                   pixels, j, i)
+        return
+
+    zx = 0.0
+    zy = 0.0
+    x2 = 0.0
+    y2 = 0.0
+    w = 0.0
+
+    # Brent's cycle detection state, matching the CPU point kernel.
+    x_old = 0.0
+    y_old = 0.0
+    power = 1
+    lam = 1
+
+    dx = 0.0
+    dy = 0.0
+
+    iterations = 0
+
+    for k in range(max_iterations):
+        zx = x2 - y2 + x0
+        zy = w - x2 - y2 + y0
+        x2 = zx * zx
+        y2 = zy * zy
+        w = (zx + zy) * (zx + zy)
+
+        dx2 = 2 * (zx * dx - zy * dy) + 1
+        dy = 2 * (zy * dx + zx * dy)
+        dx = dx2
+
+        iterations += 1
+
+        if x2 + y2 >= escape_radius_squared:
+            break
+
+        if period_checking:
+            if abs(zx - x_old) + abs(zy - y_old) < 1e-15:
+                iterations = max_iterations
+                break
+
+            if lam == power:
+                power *= 2
+                lam = 0
+                x_old = zx
+                y_old = zy
+
+            lam += 1
+
+    z = x2 + y2
+    dz = dx * dx + dy * dy
+
+    distance_estimate = 0.0
+
+    if iterations != max_iterations:
+        distance_estimate = math.log(z) * math.sqrt(z / dz)
+
+    determine_colorscheme_cuda(max_iterations, iterations, distance_estimate, zx, zy,
+                               log2_log2_escape_radius, smooth, color_scheme, color_map, pixels, j, i)
+
+
+def compute_raster_cuda(pixels, x, y, max_iterations, escape_radius, log2_log2_escape_radius, smooth,
+                        color_scheme, color_map, period_checking):
+    """
+    Host wrapper for the CUDA raster path.
+
+    Uploads the coordinate arrays and color map once, launches one thread per pixel in 16x16
+    blocks, and copies the finished image back into the caller's pixel buffer.
+
+    Parameters mirror the CPU compute_raster, with color_scheme passed explicitly since the GPU
+    kernel does its own (launch-uniform) scheme dispatch.
+    """
+
+    pixels_d = cuda.to_device(pixels)
+    x_d = cuda.to_device(x)
+    y_d = cuda.to_device(y)
+    color_map_d = cuda.to_device(color_map)
+
+    threads = (16, 16)
+    blocks = ((x.shape[0] + threads[0] - 1) // threads[0],
+              (y.shape[0] + threads[1] - 1) // threads[1])
+
+    raster_cuda[blocks, threads](pixels_d, x_d, y_d, max_iterations,
+                                 escape_radius * escape_radius, log2_log2_escape_radius,
+                                 smooth, color_scheme, color_map_d, period_checking)
+
+    cuda.synchronize()
+
+    pixels_d.copy_to_host(pixels)
@@ -1,198 +1,281 @@
-from numba import njit, u1, i4, f8, u8, b1, prange
+from numba import njit, prange, void, u4, b1, i4
+
+from .coloring import FASTMATH_FLAGS
 import numpy as np
 
-from .calculation import calculate
 
+@njit(void(u4[:, :], b1[:, :], b1[:, :], i4[:], i4[:], u4))
+def mark_and_fill(pixels32, seen, in_set, tl, br, color):
+    """
+    Fills the box [tl, br) with a flat color and marks it seen in a single pass.
+
+    Fusing the fills keeps the box bounds in registers and touches the box metadata once
+    instead of sweeping the region twice. Filled boxes are always in-set boxes, so the
+    membership cache is marked along the way. The color is stored as one packed 32-bit
+    RGBA word per pixel through the aliased uint32 view.
+
+    Parameters:
+    - pixels32 (numpy.ndarray): The pixel buffer viewed as one uint32 word per pixel.
+    - seen (numpy.ndarray): Array to track pixels that have been calculated.
+    - in_set (numpy.ndarray): Per-pixel Mandelbrot membership cache.
+    - tl (numpy.ndarray): Top-left coordinates of the region.
+    - br (numpy.ndarray): Bottom-right coordinates of the region.
+    - color (int): Packed uint32 RGBA fill color.
+    """
+
+    for j in range(tl[1], br[1]):
+        for i in range(tl[0], br[0]):
+            pixels32[j, i] = color
+            in_set[j, i] = True
+            seen[j, i] = True
+
+
+@njit
+def calculate_border_point(i, j,
+                           pixels,
+                           seen,
+                           in_set,
+                           x,
+                           y,
+                           max_iterations: int,
+                           escape_radius: float,
+                           log2_log2_escape_radius: float,
+                           calculate,
+                           color_map):
+    """
+    Calculates one border pixel, reusing the cached color and membership when available.
+
+    Adjacent quadtree boxes share whole border rows and columns, and a child's outer border is
+    computed by its parent; with seen/in_set as the cache, each border pixel is iterated once per
+    render instead of once per box that touches it.
+
+    Parameters:
+    - i (int): Pixel column.
+    - j (int): Pixel row.
+    - pixels (numpy.ndarray): Array to store the calculated fractal values; doubles as the color
+      cache for seen pixels.
+    - seen (numpy.ndarray): Array to track pixels that have been calculated.
+    - in_set (numpy.ndarray): Per-pixel Mandelbrot membership cache.
+    - x (numpy.ndarray): Array of x-coordinates in the complex plane.
+    - y (numpy.ndarray): Array of y-coordinates in the complex plane.
+    - max_iterations (int): Maximum number of iterations.
+    - escape_radius (float): Escape radius for the fractal.
+    - log2_log2_escape_radius (float): Precomputed log2(log2(escape_radius)) for the render.
+    - calculate: Specialized point kernel for the render configuration.
+    - color_map: Color map for mapping fractal values to colors.
+
+    Returns:
+    - bool: Whether the pixel lies in the Mandelbrot set.
+    """
 
-@njit(u1[:](i4[:], i4[:], u1[:, :, :], b1[:, :], f8[:], f8[:], u8, f8, b1, u1, u1[:, :], b1))
-def calculate_mixed(tl, br,
+    if seen[j, i]:
+        return in_set[j, i]
+
+    inSet = calculate(x[i],
+                      y[j],
+                      max_iterations,
+                      escape_radius,
+                      log2_log2_escape_radius,
+                      color_map,
+                      pixels[j, i]) == 1
+
+    in_set[j, i] = inSet
+    seen[j, i] = True
+
+    return inSet
+
+
+
+@njit
+def calculate_mixed(tl0, tl1, br0, br1,
                     pixels,
+                    pixels32,
                     seen,
+                    in_set,
                     x,
                     y,
                     max_iterations: int,
                     escape_radius: float,
-                    smooth: bool,
-                    color_scheme: int,
+                    log2_log2_escape_radius: float,
+                    calculate,
                     color_map,
-                    period_checking: bool,
                     ):
 
     """
     Calculate mixed quadtree within the specified region.
 
     Parameters:
-    - tl (numpy.ndarray): Top-left coordinates of the region.
-    - br (numpy.ndarray): Bottom-right coordinates of the region.
+    - tl0 (int): x-coordinate of the top-left corner of the region.
+    - tl1 (int): y-coordinate of the top-left corner of the region.
+    - br0 (int): x-coordinate of the bottom-right corner of the region.
+    - br1 (int): y-coordinate of the bottom-right corner of the region.
     - pixels (numpy.ndarray): Array to store the calculated fractal values.
+    - pixels32 (numpy.ndarray): The same pixel buffer viewed as one uint32 word per pixel.
     - seen (numpy.ndarray): Array to track pixels that have been calculated.
+    - in_set (numpy.ndarray): Per-pixel Mandelbrot membership cache; lets neighbouring boxes reuse
+      shared border pixels instead of re-iterating them.
     - x (numpy.ndarray): Array of x-coordinates in the complex plane.
     - y (numpy.ndarray): Array of y-coordinates in the complex plane.
     - max_iterations (int): Maximum number of iterations.
     - escape_radius (float): Escape radius for the fractal.
-    - smooth (bool): Flag indicating whether to use smooth coloring.
-    - color_scheme (int): Fractal coloring scheme.
+    - log2_log2_escape_radius (float): Precomputed log2(log2(escape_radius)) for the render.
+    - calculate: Specialized point kernel for the render configuration (color scheme, smooth
+      coloring and period checking are baked in).
     - color_map: Color map for mapping fractal values to colors.
-    - period_checking (bool): Flag indicating whether to perform period checking.
 
     Returns:
-    - numpy.ndarray: Result array containing information about split, Mandelbrot membership, and border color.
+    - tuple: (split flag, Mandelbrot membership, border color) as uint8 scalars and a packed
+      uint32 RGBA word.
     """
 
 
-    cols = br[0] - tl[0]
-    rows = br[1] - tl[1]
+    cols = br0 - tl0
+    rows = br1 - tl1
 
     if rows == 1 and cols == 1:
-        color = calculate(x[tl[0]],
-                          y[tl[1]],
-                          max_iterations,
-                          escape_radius,
-                          smooth,
-                          color_scheme,
-                          color_map,
-                          period_checking)[1:]
-
-        seen[tl[1]][tl[0]] = True
-
-        return np.array([0, color[0], color[1], color[2]], dtype=np.uint8)
-
-    isMandelbrot = True
-    hasMandelbrot = False
-    border = np.array([0, 0, 0], dtype=np.uint8)
-
-    for i in range(tl[0], br[0]):
-        top = calculate(x[i],
-                        y[tl[1]],
-                        max_iterations,
-                        escape_radius,
-                        smooth,
-                        color_scheme,
-                        color_map,
-                        period_checking)
+        calculate_border_point(tl0, tl1, pixels, seen, in_set, x, y,
+                               max_iterations, escape_radius, log2_log2_escape_radius,
+                               calculate, color_map)
 
-        inSet = top[0] == 1
-        top_color = top[1:]
+        return np.uint8(0), np.uint8(0), pixels32[tl1, tl0]
 
-        if not hasMandelbrot and inSet:
-            border = top_color
+    # In-set membership is reduced to a plain counter instead of the chained
+    # isMandelbrot &= / hasMandelbrot |= flag updates: the increment carries no
+    # data dependency between border pixels, and the full/partial/empty verdicts
+    # fall out of one comparison against the perimeter after the walk. All in-set
+    # pixels share one color (they all reach max_iterations), so recording where
+    # the first one landed is enough to recover the border color afterwards.
+    in_count = 0
+    first_i = -1
+    first_j = -1
 
-        isMandelbrot &= inSet
-        hasMandelbrot |= inSet
+    for i in range(tl0, br0):
+        inSet = calculate_border_point(i, tl1, pixels, seen, in_set, x, y,
+                                       max_iterations, escape_radius, log2_log2_escape_radius,
+                                       calculate, color_map)
 
-        pixels[tl[1]][i] = top_color
+        if inSet and first_j < 0:
+            first_i = i
+            first_j = tl1
 
-        bottom = calculate(x[i],
-                           y[br[1] - 1],
-                           max_iterations,
-                           escape_radius,
-                           smooth,
-                           color_scheme,
-                           color_map,
-                           period_checking)
+        in_count += inSet
 
-        inSet = bottom[0] == 1
-        bottom_color = bottom[1:]
+        inSet = calculate_border_point(i, br1 - 1, pixels, seen, in_set, x, y,
+                                       max_iterations, escape_radius, log2_log2_escape_radius,
+                                       calculate, color_map)
 
-        if not hasMandelbrot and inSet:
-            border = bottom_color
+        if inSet and first_j < 0:
+            first_i = i
+            first_j = br1 - 1
 
-        isMandelbrot &= inSet
-        hasMandelbrot |= inSet
+        in_count += inSet
 
-        pixels[br[1] - 1][i] = bottom_color
-
-        seen[tl[1]][i] = True
-        seen[br[1] - 1][i] = True
-
-    for j in range(tl[1], br[1]):
-        left = calculate(x[tl[0]],
-                         y[j],
-                         max_iterations,
-                         escape_radius,
-                         smooth,
-                         color_scheme,
-                         color_map,
-                         period_checking)
+    # The row loops above already computed the four corner pixels, so the side columns only
+    # walk the rows strictly between them.
+    for j in range(tl1 + 1, br1 - 1):
+        inSet = calculate_border_point(tl0, j, pixels, seen, in_set, x, y,
+                                       max_iterations, escape_radius, log2_log2_escape_radius,
+                                       calculate, color_map)
 
-        inSet = left[0] == 1
-        left_color = left[1:]
+        if inSet and first_j < 0:
+            first_i = tl0
+            first_j = j
 
-        isMandelbrot &= inSet
-        hasMandelbrot |= inSet
+        in_count += inSet
 
-        if not hasMandelbrot and inSet:
-            border = left_color
+        inSet = calculate_border_point(br0 - 1, j, pixels, seen, in_set, x, y,
+                                       max_iterations, escape_radius, log2_log2_escape_radius,
+                                       calculate, color_map)
 
-        pixels[j][tl[0]] = left_color
+        if inSet and first_j < 0:
+            first_i = br0 - 1
+            first_j = j
 
-        right = calculate(x[br[0] - 1],
-                          y[j],
-                          max_iterations,
-                          escape_radius,
-                          smooth,
-                          color_scheme,
-                          color_map, period_checking)
+        in_count += inSet
 
-        inSet = right[0] == 1
-        right_color = right[1:]
+    # Matches the walk above: the row loops visit 2*cols pixels, the column loops the
+    # rows strictly between them (empty for boxes shorter than 3 pixels).
+    perimeter = 2 * cols + 2 * max(rows - 2, 0)
 
-        isMandelbrot &= inSet
-        hasMandelbrot |= inSet
+    border = np.uint32(0)
+    if first_j >= 0:
+        border = pixels32[first_j, first_i]
 
-        if not hasMandelbrot and inSet:
-            border = right_color
+    split_val = np.uint8(0)
 
-        pixels[j][br[0] - 1] = right_color
+    if 0 < in_count < perimeter and cols >= 3 and rows >= 3:
+        split_val = np.uint8(1)
 
-        seen[j][tl[0]] = True
-        seen[j][br[0] - 1] = True
+    mandelbrot_val = np.uint8(0)
+    if in_count == perimeter:
+        mandelbrot_val = np.uint8(1)
 
-    split_val = 0
+    return split_val, mandelbrot_val, border
 
-    if isMandelbrot != hasMandelbrot and cols >= 3 and rows >= 3:
-        split_val = 1
 
-    mandelbrot_val = 1
-    if not isMandelbrot:
-        mandelbrot_val = 0
-
-    return np.array([split_val, mandelbrot_val, border[0], border[1], border[2]], dtype=np.uint8)
-
-
-@njit(u1[:, :](i4[:, :, :], u1[:, :, :], b1[:, :], f8[:], f8[:], u8, f8, b1, u1, u1[:, :], b1), parallel=True)
-def fast_mixed_quadtree(intervals, pixels, seen, x,
+@njit(parallel=True, fastmath=FASTMATH_FLAGS, nogil=True)
+def fast_mixed_quadtree(tl_x, tl_y, br_x, br_y, pixels, pixels32, seen, in_set, x,
                         y,
                         max_iterations: int,
                         escape_radius: float,
-                        smooth: bool,
-                        color_scheme: int,
+                        log2_log2_escape_radius: float,
+                        calculate,
                         color_map,
-                        period_checking: bool, ):
+                        ):
     """
     Perform fast parallel computation of mixed fractal values for multiple quadtrees.
 
     Parameters:
-    - intervals (numpy.ndarray): Array of intervals to compute fractal values.
+    - tl_x, tl_y, br_x, br_y (numpy.ndarray): Box corner coordinates, one dense int32 array per
+      component.
     - pixels (numpy.ndarray): Array to store the calculated fractal values.
+    - pixels32 (numpy.ndarray): The same pixel buffer viewed as one uint32 word per pixel.
     - seen (numpy.ndarray): Array to track pixels that have been calculated.
+    - in_set (numpy.ndarray): Per-pixel Mandelbrot membership cache.
     - x (numpy.ndarray): Array of x-coordinates in the complex plane.
     - y (numpy.ndarray): Array of y-coordinates in the complex plane.
     - max_iterations (int): Maximum number of iterations.
     - escape_radius (float): Escape radius for the fractal.
-    - smooth (bool): Flag indicating whether to use smooth coloring.
-    - color_scheme (int): Fractal coloring scheme.
+    - log2_log2_escape_radius (float): Precomputed log2(log2(escape_radius)) for the render.
+    - calculate: Specialized point kernel for the render configuration (color scheme, smooth
+      coloring and period checking are baked in).
     - color_map: Color map for mapping fractal values to colors.
-    - period_checking (bool): Flag indicating whether to perform period checking.
 
     Returns:
-    - numpy.ndarray: Result array containing information about split, Mandelbrot membership, and border color for each interval.
+    - numpy.ndarray: Result array containing information about split, Mandelbrot membership, and border color for each box.
+    """
+
+    results = np.zeros(shape=(tl_x.shape[0], 3), dtype=np.uint32)
+
+    for i in prange(tl_x.shape[0]):
+        (results[i, 0], results[i, 1],
+         results[i, 2]) = calculate_mixed(tl_x[i], tl_y[i], br_x[i], br_y[i], pixels, pixels32, seen, in_set, x, y,
+                                          max_iterations, escape_radius,
+                                          log2_log2_escape_radius, calculate, color_map)
+
+    return results
+
+
+@njit(fastmath=FASTMATH_FLAGS, nogil=True)
+def fast_mixed_quadtree_serial(tl_x, tl_y, br_x, br_y, pixels, pixels32, seen, in_set, x,
+                               y,
+                               max_iterations: int,
+                               escape_radius: float,
+                               log2_log2_escape_radius: float,
+                               calculate,
+                               color_map,
+                               ):
+    """
+    Serial sibling of fast_mixed_quadtree for small levels, where the parallel dispatch overhead
+    outweighs the work. Same contract and result layout.
     """
 
-    results = np.zeros(shape=(intervals.shape[0], 4), dtype=np.uint8)
+    results = np.zeros(shape=(tl_x.shape[0], 3), dtype=np.uint32)
 
-    for i in prange(intervals.shape[0]):
-        results[i] = calculate_mixed(intervals[i][0], intervals[i][1], pixels, seen, x, y, max_iterations, escape_radius,
-                                     smooth, color_scheme, color_map, period_checking)
+    for i in range(tl_x.shape[0]):
+        (results[i, 0], results[i, 1],
+         results[i, 2]) = calculate_mixed(tl_x[i], tl_y[i], br_x[i], br_y[i], pixels, pixels32, seen, in_set, x, y,
+                                          max_iterations, escape_radius,
+                                          log2_log2_escape_radius, calculate, color_map)
 
     return results
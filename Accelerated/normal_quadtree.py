@@ -1,177 +1,186 @@
-from numba import njit, u1, i4, f8, u8, b1, prange
+from numba import njit, prange
+
+from .coloring import FASTMATH_FLAGS
 import numpy as np
-from .calculation import calculate
 
 
-@njit(u1[:](i4[:], i4[:], u1[:, :, :], f8[:], f8[:], u8, f8, b1, u1, u1[:, :], b1))
-def calculate_quadtree(tl, br,
+@njit
+def calculate_quadtree(tl0, tl1, br0, br1,
                        pixels,
+                       pixels32,
                        x,
                        y,
                        max_iterations: int,
                        escape_radius: float,
-                       smooth: bool,
-                       color_scheme: int,
+                       log2_log2_escape_radius: float,
+                       calculate,
                        color_map,
-                       period_checking: bool,
                        ):
     """
     Calculate quadtree fractal values within the specified region.
 
+    Border colors are handled as packed 32-bit RGBA words through the aliased pixels32 view, so
+    the split test is a single word compare per pixel instead of three channel compares.
+
     Parameters:
-    - tl (numpy.ndarray): Top-left coordinates of the region.
-    - br (numpy.ndarray): Bottom-right coordinates of the region.
+    - tl0 (int): x-coordinate of the top-left corner of the region.
+    - tl1 (int): y-coordinate of the top-left corner of the region.
+    - br0 (int): x-coordinate of the bottom-right corner of the region.
+    - br1 (int): y-coordinate of the bottom-right corner of the region.
     - pixels (numpy.ndarray): Array to store the calculated fractal values.
+    - pixels32 (numpy.ndarray): The same pixel buffer viewed as one uint32 word per pixel.
     - x (numpy.ndarray): Array of x-coordinates in the complex plane.
     - y (numpy.ndarray): Array of y-coordinates in the complex plane.
     - max_iterations (int): Maximum number of iterations.
     - escape_radius (float): Escape radius for the fractal.
-    - smooth (bool): Flag indicating whether to use smooth coloring.
-    - color_scheme (int): Fractal coloring scheme.
+    - log2_log2_escape_radius (float): Precomputed log2(log2(escape_radius)) for the render.
+    - calculate: Specialized point kernel for the render configuration (color scheme, smooth
+      coloring and period checking are baked in).
     - color_map: Color map for mapping fractal values to colors.
-    - period_checking (bool): Flag indicating whether to perform period checking.
 
     Returns:
-    - numpy.ndarray: Result array containing information about split, border color.
+    - tuple: (split flag, border color) as a uint8 scalar and a packed uint32 RGBA word.
     """
 
-    cols = br[0] - tl[0]
-    rows = br[1] - tl[1]
+    cols = br0 - tl0
+    rows = br1 - tl1
 
     if rows == 1 and cols == 1:
-        color = calculate(x[tl[0]],
-                          y[tl[1]],
-                          max_iterations,
-                          escape_radius,
-                          smooth,
-                          color_scheme,
-                          color_map,
-                          period_checking)[1:]
+        calculate(x[tl0],
+                  y[tl1],
+                  max_iterations,
+                  escape_radius,
+                  log2_log2_escape_radius,
+                  color_map,
+                  pixels[tl1, tl0])
 
-        return np.array([0, color[0], color[1], color[2]], dtype=np.uint8)
+        return np.uint8(0), pixels32[tl1, tl0]
 
     split = False
     border_set = False
-    border = np.array([-1, -1, -1], dtype=np.uint8)
+    border = np.uint32(0)
 
-    for i in range(tl[0], br[0]):
-        if border_set:
-            top_color = calculate(x[i],
-                                  y[tl[1]],
-                                  max_iterations,
-                                  escape_radius,
-                                  smooth,
-                                  color_scheme,
-                                  color_map,
-                                  period_checking)[1:]
+    for i in range(tl0, br0):
+        calculate(x[i],
+                  y[tl1],
+                  max_iterations,
+                  escape_radius,
+                  log2_log2_escape_radius,
+                  color_map,
+                  pixels[tl1, i])
 
+        if border_set:
             if not split and cols >= 3 and rows >= 3:
-                split |= not np.array_equal(border, top_color)
-
-            pixels[tl[1]][i] = top_color
-
-            bottom_color = calculate(x[i],
-                                     y[br[1] - 1],
-                                     max_iterations,
-                                     escape_radius,
-                                     smooth,
-                                     color_scheme,
-                                     color_map,
-                                     period_checking)[1:]
-            if not split and cols >= 3 and rows >= 3:
-                split |= not np.array_equal(border, bottom_color)
-
-            pixels[br[1] - 1][i] = bottom_color
+                split |= border != pixels32[tl1, i]
         else:
-            border = calculate(x[i], y[tl[1]],
-                               max_iterations,
-                               escape_radius,
-                               smooth, color_scheme,
-                               color_map,
-                               period_checking)[1:]
-
-            pixels[tl[1]][i] = border
-
-            bottom_color = calculate(x[i],
-                                     y[br[1] - 1],
-                                     max_iterations,
-                                     escape_radius, smooth, color_scheme,
-                                     color_map,
-                                     period_checking)[1:]
-
-            if not split and cols >= 3 and rows >= 3:
-                split |= not np.array_equal(border, bottom_color)
-
-            pixels[br[1] - 1][i] = bottom_color
-
+            border = pixels32[tl1, tl0]
             border_set = True
 
-    for j in range(tl[1], br[1]):
-        left_color = calculate(x[tl[0]],
-                               y[j],
-                               max_iterations,
-                               escape_radius,
-                               smooth,
-                               color_scheme,
-                               color_map,
-                               period_checking)[1:]
-        pixels[j][tl[0]] = left_color
+        calculate(x[i],
+                  y[br1 - 1],
+                  max_iterations,
+                  escape_radius,
+                  log2_log2_escape_radius,
+                  color_map,
+                  pixels[br1 - 1, i])
 
         if not split and cols >= 3 and rows >= 3:
-            split |= not np.array_equal(border, left_color)
+            split |= border != pixels32[br1 - 1, i]
+
+    # The row loops above already computed the four corner pixels, so the side columns only
+    # walk the rows strictly between them.
+    for j in range(tl1 + 1, br1 - 1):
+        calculate(x[tl0],
+                  y[j],
+                  max_iterations,
+                  escape_radius,
+                  log2_log2_escape_radius,
+                  color_map,
+                  pixels[j, tl0])
 
-        right_color = calculate(x[br[0] - 1],
-                                y[j],
-                                max_iterations,
-                                escape_radius,
-                                smooth,
-                                color_scheme,
-                                color_map, period_checking)[1:]
-        pixels[j][br[0] - 1] = right_color
+        if not split and cols >= 3 and rows >= 3:
+            split |= border != pixels32[j, tl0]
+
+        calculate(x[br0 - 1],
+                  y[j],
+                  max_iterations,
+                  escape_radius,
+                  log2_log2_escape_radius,
+                  color_map,
+                  pixels[j, br0 - 1])
 
         if not split and cols >= 3 and rows >= 3:
-            split |= not np.array_equal(border, right_color)
+            split |= border != pixels32[j, br0 - 1]
 
-    split_val = 0
+    split_val = np.uint8(0)
 
     if split:
-        split_val = 1
+        split_val = np.uint8(1)
 
-    return np.array([split_val, border[0], border[1], border[2]], dtype=np.uint8)
+    return split_val, border
 
 
-@njit(u1[:, :](i4[:, :, :], u1[:, :, :], f8[:], f8[:], u8, f8, b1, u1, u1[:, :], b1), parallel=True)
-def compute_fast_quadtree(intervals, pixels, x,
+@njit(parallel=True, fastmath=FASTMATH_FLAGS, nogil=True)
+def compute_fast_quadtree(tl_x, tl_y, br_x, br_y, pixels, pixels32, x,
                           y,
                           max_iterations: int,
                           escape_radius: float,
-                          smooth: bool,
-                          color_scheme: int,
+                          log2_log2_escape_radius: float,
+                          calculate,
                           color_map,
-                          period_checking: bool, ):
+                          ):
     """
-    Perform fast parallel computation of quadtree fractal values for multiple intervals.
+    Perform fast parallel computation of quadtree fractal values for multiple boxes.
 
     Parameters:
-    - intervals (numpy.ndarray): Array of intervals to compute fractal values.
+    - tl_x, tl_y, br_x, br_y (numpy.ndarray): Box corner coordinates, one dense int32 array per
+      component.
     - pixels (numpy.ndarray): Array to store the calculated fractal values.
+    - pixels32 (numpy.ndarray): The same pixel buffer viewed as one uint32 word per pixel.
     - x (numpy.ndarray): Array of x-coordinates in the complex plane.
     - y (numpy.ndarray): Array of y-coordinates in the complex plane.
     - max_iterations (int): Maximum number of iterations.
     - escape_radius (float): Escape radius for the fractal.
-    - smooth (bool): Flag indicating whether to use smooth coloring.
-    - color_scheme (int): Fractal coloring scheme.
+    - log2_log2_escape_radius (float): Precomputed log2(log2(escape_radius)) for the render.
+    - calculate: Specialized point kernel for the render configuration (color scheme, smooth
+      coloring and period checking are baked in).
     - color_map: Color map for mapping fractal values to colors.
-    - period_checking (bool): Flag indicating whether to perform period checking.
 
     Returns:
-    - numpy.ndarray
+    - numpy.ndarray: (N, 2) uint32 array of (split flag, packed border color) rows.
+    """
+
+    results = np.zeros(shape=(tl_x.shape[0], 2), dtype=np.uint32)
+
+    for i in prange(tl_x.shape[0]):
+        (results[i, 0],
+         results[i, 1]) = calculate_quadtree(tl_x[i], tl_y[i], br_x[i], br_y[i], pixels, pixels32, x, y,
+                                             max_iterations, escape_radius,
+                                             log2_log2_escape_radius, calculate, color_map)
+
+    return results
+
+
+@njit(fastmath=FASTMATH_FLAGS, nogil=True)
+def compute_fast_quadtree_serial(tl_x, tl_y, br_x, br_y, pixels, pixels32, x,
+                                 y,
+                                 max_iterations: int,
+                                 escape_radius: float,
+                                 log2_log2_escape_radius: float,
+                                 calculate,
+                                 color_map,
+                                 ):
+    """
+    Serial sibling of compute_fast_quadtree for small levels, where the parallel dispatch overhead
+    outweighs the work. Same contract and result layout.
     """
 
-    results = np.zeros(shape=(intervals.shape[0], 4), dtype=np.uint8)
+    results = np.zeros(shape=(tl_x.shape[0], 2), dtype=np.uint32)
 
-    for i in prange(intervals.shape[0]):
-        results[i] = calculate_quadtree(intervals[i][0], intervals[i][1], pixels, x, y, max_iterations, escape_radius,
-                                        smooth, color_scheme, color_map, period_checking)
+    for i in range(tl_x.shape[0]):
+        (results[i, 0],
+         results[i, 1]) = calculate_quadtree(tl_x[i], tl_y[i], br_x[i], br_y[i], pixels, pixels32, x, y,
+                                             max_iterations, escape_radius,
+                                             log2_log2_escape_radius, calculate, color_map)
 
     return results
@@ -1,37 +1,260 @@
-from numba import njit, u1, f8, u8, b1, void, prange
-from .calculation import calculate
+import numpy as np
+from numba import njit, prange, set_parallel_chunksize
+from .calculation import in_main_body
+from .coloring import FASTMATH_FLAGS, continous_dwell
 
 
-@njit(void(u1[:, :, :], b1[:, :], f8[:], f8[:], u8, f8, b1, u1, u1[:, :], b1), parallel=True)
-def compute_raster(pixels, seen, x, y, max_iterations: int,
+@njit(fastmath=True, boundscheck=False)
+def iterate_row(x_origin, x_step, i_base, y0, max_iterations, escape_radius_squared, done, iterations_out,
+                final_x, final_y, final_dx, final_dy):
+    """
+    Iterates a whole row of points through the Mandelbrot recurrence in lockstep.
+
+    All lanes of the row advance together through straight-line floating point updates, which lets
+    LLVM auto-vectorize the inner loop; a whole-row divergence check runs only every 8 iterations so
+    the hot loop stays branch-light. Lane x-coordinates are generated inline from the grid's affine
+    transform (the same expression that builds the coordinate array, so the values are identical)
+    rather than loaded from memory.
+
+    Parameters:
+    - x_origin (float): x-coordinate of pixel column 0.
+    - x_step (float): x-step per pixel column.
+    - i_base (int): Absolute pixel column of the row's first lane.
+    - y0 (float): y-coordinate shared by the row.
+    - max_iterations (int): Maximum number of iterations.
+    - escape_radius_squared (float): Squared escape radius for the divergence check.
+    - done (numpy.ndarray): Per-lane flags; lanes already marked are skipped and left untouched.
+    - iterations_out (numpy.ndarray): Per-lane escape iteration counts written by this function.
+    - final_x (numpy.ndarray): Per-lane final x-value of the sequence.
+    - final_y (numpy.ndarray): Per-lane final y-value of the sequence.
+    - final_dx (numpy.ndarray): Per-lane final derivative x-component.
+    - final_dy (numpy.ndarray): Per-lane final derivative y-component.
+
+    Returns:
+    - None
+    """
+
+    n = done.shape[0]
+
+    # Lane state inherits the caller's coordinate precision (FP32 for shallow views,
+    # FP64 at deep zoom).
+    x = np.zeros(n, dtype=final_x.dtype)
+    y = np.zeros(n, dtype=final_x.dtype)
+    x2 = np.zeros(n, dtype=final_x.dtype)
+    y2 = np.zeros(n, dtype=final_x.dtype)
+    w = np.zeros(n, dtype=final_x.dtype)
+    dx = np.zeros(n, dtype=final_x.dtype)
+    dy = np.zeros(n, dtype=final_x.dtype)
+
+    for i in range(n):
+        if not done[i]:
+            iterations_out[i] = max_iterations
+
+    for k in range(max_iterations):
+        for i in range(n):
+            if done[i] or iterations_out[i] != max_iterations:
+                continue
+
+            x[i] = x2[i] - y2[i] + (x_origin + (i_base + i) * x_step)
+            y[i] = w[i] - x2[i] - y2[i] + y0
+            x2[i] = x[i] * x[i]
+            y2[i] = y[i] * y[i]
+            w[i] = (x[i] + y[i]) * (x[i] + y[i])
+
+            dx2 = 2 * (x[i] * dx[i] - y[i] * dy[i]) + 1
+            dy[i] = 2 * (y[i] * dx[i] + x[i] * dy[i])
+            dx[i] = dx2
+
+            if x2[i] + y2[i] >= escape_radius_squared:
+                iterations_out[i] = k + 1
+
+        if k & 7 == 7:
+            alive = False
+            for i in range(n):
+                if not done[i] and iterations_out[i] == max_iterations:
+                    alive = True
+                    break
+            if not alive:
+                break
+
+    for i in range(n):
+        if not done[i]:
+            final_x[i] = x[i]
+            final_y[i] = y[i]
+            final_dx[i] = dx[i]
+            final_dy[i] = dy[i]
+
+
+@njit(parallel=True, fastmath=FASTMATH_FLAGS, nogil=True)
+def compute_raster(pixels, seen, x_origin, dx, y, max_iterations: int,
                    escape_radius: float,
+                   log2_log2_escape_radius: float,
                    smooth: bool,
-                   color_scheme: int,
-                   color_map,
-                   period_checking: bool):
+                   colorize,
+                   color_map):
     """
     Compute raster fractal values for a given set of coordinates.
 
     Parameters:
     - pixels (numpy.ndarray): Array to store the calculated fractal values.
     - seen (numpy.ndarray): Array indicating whether pixels have been previously computed.
-    - x (numpy.ndarray): Array of x-coordinates in the complex plane.
-    - y (numpy.ndarray): Array of y-coordinates in the complex plane.
+    - x_origin (float): x-coordinate of pixel column 0.
+    - dx (float): x-step per pixel column.
+    - y (numpy.ndarray): Array of y-coordinates in the complex plane (kept as an array because the
+      symmetric fold makes it non-affine).
     - max_iterations (int): Maximum number of iterations.
     - escape_radius (float): Escape radius for the fractal.
+    - log2_log2_escape_radius (float): Precomputed log2(log2(escape_radius)) for the render.
     - smooth (bool): Flag indicating whether to use smooth coloring.
-    - color_scheme (int): Fractal coloring scheme.
+    - colorize: Specialized colorizer kernel for the render's color scheme.
     - color_map: Color map for mapping fractal values to colors.
-    - period_checking (bool): Flag indicating whether to perform period checking.
 
     Returns:
     - None
 
-    The function populates the `pixels` array with calculated fractal values based on the given parameters.
+    The function populates the `pixels` array with calculated fractal values in 64x64 tiles: each
+    thread owns a band of rows and walks it tile by tile, so the coordinate slices and the tile's
+    output pixels stay resident in L1 while `iterate_row` advances the tile's rows in SIMD-friendly
+    lockstep. Points in the main body never diverge, so they are colored directly without
+    iterating; period checking is never needed on this path because in-set lanes simply run to
+    max_iterations and produce the same color.
+
+    Iteration cost is wildly skewed between exterior and interior tiles, so the tiles are handed
+    out one at a time (parallel chunk size 1) instead of striping contiguous bands per thread,
+    which would leave threads with only exterior tiles idle.
+    """
+
+    tile = 64
+    n = pixels.shape[1]
+    escape_radius_squared = escape_radius * escape_radius
+
+    row_tiles = (y.shape[0] + tile - 1) // tile
+    col_tiles = (n + tile - 1) // tile
+
+    old_chunksize = set_parallel_chunksize(1)
+
+    for t in prange(row_tiles * col_tiles):
+        j0 = (t // col_tiles) * tile
+        j1 = min(j0 + tile, y.shape[0])
+
+        i0 = (t % col_tiles) * tile
+        i1 = min(i0 + tile, n)
+        width = i1 - i0
+
+        for j in range(j0, j1):
+            done = np.zeros(width, dtype=np.bool_)
+            iterations = np.zeros(width, dtype=np.uint64)
+            final_x = np.zeros(width, dtype=y.dtype)
+            final_y = np.zeros(width, dtype=y.dtype)
+            final_dx = np.zeros(width, dtype=y.dtype)
+            final_dy = np.zeros(width, dtype=y.dtype)
+
+            for i in range(width):
+                cx = x_origin + (i0 + i) * dx
+
+                if seen[j, i0 + i]:
+                    done[i] = True
+                elif in_main_body(cx, y[j]):
+                    colorize(max_iterations, max_iterations, 0.0, cx, y[j],
+                             log2_log2_escape_radius, smooth, color_map, pixels[j, i0 + i])
+                    done[i] = True
+
+            iterate_row(x_origin, dx, i0, y[j], max_iterations, escape_radius_squared, done, iterations,
+                        final_x, final_y, final_dx, final_dy)
+
+            for i in range(width):
+                if done[i]:
+                    continue
+
+                z = final_x[i] * final_x[i] + final_y[i] * final_y[i]
+                dz = final_dx[i] * final_dx[i] + final_dy[i] * final_dy[i]
+
+                distance_estimate = 0.0
+
+                if iterations[i] != max_iterations:
+                    distance_estimate = np.log(z) * np.sqrt(z / dz)
+
+                colorize(max_iterations, iterations[i], distance_estimate, final_x[i], final_y[i],
+                         log2_log2_escape_radius, smooth, color_map, pixels[j, i0 + i])
+
+    set_parallel_chunksize(old_chunksize)
+
+
+@njit(parallel=True, fastmath=FASTMATH_FLAGS, nogil=True)
+def compute_dwell_indices(indices, x_origin, dx, y, max_iterations: int,
+                          escape_radius: float,
+                          log2_log2_escape_radius: float,
+                          smooth: bool):
+    """
+    Compute the colormap lookup index for every pixel without coloring anything.
+
+    Parameters:
+    - indices (numpy.ndarray): Per-pixel lookup indices written by this function.
+    - x_origin (float): x-coordinate of pixel column 0.
+    - dx (float): x-step per pixel column.
+    - y (numpy.ndarray): Array of y-coordinates in the complex plane.
+    - max_iterations (int): Maximum number of iterations.
+    - escape_radius (float): Escape radius for the fractal.
+    - log2_log2_escape_radius (float): Precomputed log2(log2(escape_radius)) for the render.
+    - smooth (bool): Flag indicating whether to use smooth coloring.
+
+    Returns:
+    - None
+
+    The colormap scheme is a pure function of the (smoothed) dwell, so this kernel only runs the
+    iteration loop and writes the clamped table index; the caller colors the whole grid in one
+    NumPy fancy-index over the lookup table, which runs as a single vectorized C gather instead of
+    per-pixel stores. Same tiling and dynamic tile hand-out as compute_raster.
     """
 
-    for i in prange(y.shape[0]):
-        for j in range(x.shape[0]):
-            if seen.shape[1] != 0 and not seen[i, j]:
-                pixels[i, j] = calculate(x[j], y[i], max_iterations, escape_radius, smooth, color_scheme, color_map,
-                                         period_checking)[1:]
+    tile = 64
+    n = indices.shape[1]
+    escape_radius_squared = escape_radius * escape_radius
+
+    row_tiles = (y.shape[0] + tile - 1) // tile
+    col_tiles = (n + tile - 1) // tile
+
+    old_chunksize = set_parallel_chunksize(1)
+
+    for t in prange(row_tiles * col_tiles):
+        j0 = (t // col_tiles) * tile
+        j1 = min(j0 + tile, y.shape[0])
+
+        i0 = (t % col_tiles) * tile
+        i1 = min(i0 + tile, n)
+        width = i1 - i0
+
+        for j in range(j0, j1):
+            done = np.zeros(width, dtype=np.bool_)
+            iterations = np.zeros(width, dtype=np.uint64)
+            final_x = np.zeros(width, dtype=y.dtype)
+            final_y = np.zeros(width, dtype=y.dtype)
+            final_dx = np.zeros(width, dtype=y.dtype)
+            final_dy = np.zeros(width, dtype=y.dtype)
+
+            for i in range(width):
+                if in_main_body(x_origin + (i0 + i) * dx, y[j]):
+                    indices[j, i0 + i] = max_iterations
+                    done[i] = True
+
+            iterate_row(x_origin, dx, i0, y[j], max_iterations, escape_radius_squared, done, iterations,
+                        final_x, final_y, final_dx, final_dy)
+
+            for i in range(width):
+                if done[i]:
+                    continue
+
+                k = np.int64(iterations[i])
+
+                if smooth and iterations[i] != max_iterations:
+                    k = np.int64(np.floor(continous_dwell(final_x[i], final_y[i], iterations[i],
+                                                          log2_log2_escape_radius)))
+
+                if k < 0:
+                    k = 0
+                elif k > max_iterations:
+                    k = np.int64(max_iterations)
+
+                indices[j, i0 + i] = k
+
+    set_parallel_chunksize(old_chunksize)
@@ -1,6 +1,8 @@
+import math
+
 import numpy as np
 
-def continous_dwell(x, y, dwell, escape_radus=2):
+def continous_dwell(x, y, dwell, log2_log2_escape_radius=0.0):
     """
     Calculate continuous dwell value for a point in the Mandelbrot set.
 
@@ -8,13 +10,14 @@ def continous_dwell(x, y, dwell, escape_radus=2):
     - x (float): The x-coordinate of the point.
     - y (float): The y-coordinate of the point.
     - dwell (int): The dwell value (iteration count).
-    - escape_radius (float): The escape radius for determining if a point is in the Mandelbrot set.
+    - log2_log2_escape_radius (float): Precomputed log2(log2(escape_radius)); the default
+      corresponds to an escape radius of 2.
 
     Returns:
     float: Continuous dwell value.
     """
 
-    return dwell - np.log2(np.log2(x * x + y * y)) + np.log2(np.log2(escape_radus)) + 1
+    return dwell - math.log2(math.log2(x * x + y * y)) + log2_log2_escape_radius + 1
 
 
 def generate_colormap_coloring(colormap, exponetial_cyclic=True):
@@ -42,13 +45,13 @@ def generate_colormap_coloring(colormap, exponetial_cyclic=True):
 
         iteration = kwargs['iteration']
         max_iteration = kwargs['max_iteration']
-        escape_radius = kwargs['escape_radius']
+        log2_log2_escape_radius = kwargs['log2_log2_escape_radius']
         smooth = kwargs['smooth']
         x, y = kwargs['final']
 
         i = iteration
         if iteration != max_iteration and smooth:
-            i = continous_dwell(x, y, iteration, escape_radius)
+            i = continous_dwell(x, y, iteration, log2_log2_escape_radius)
 
         N = len(colormap)
 
@@ -59,6 +62,8 @@ def generate_colormap_coloring(colormap, exponetial_cyclic=True):
 
         return np.array(colormap[i])
 
+    batch_color_scheme[colormap_coloring] = generate_colormap_coloring_batch(colormap, exponetial_cyclic)
+
     return colormap_coloring, "RGB"
 
 def simple_hsv(**kwargs):
@@ -74,7 +79,7 @@ def simple_hsv(**kwargs):
 
     iteration = kwargs['iteration']
     max_iteration = kwargs['max_iteration']
-    escape_radius = kwargs['escape_radius']
+    log2_log2_escape_radius = kwargs['log2_log2_escape_radius']
     smooth = kwargs['smooth']
     x, y = kwargs['final']
 
@@ -83,7 +88,7 @@ def simple_hsv(**kwargs):
 
     i = iteration
     if smooth:
-        i = continous_dwell(x, y, iteration, escape_radius)
+        i = continous_dwell(x, y, iteration, log2_log2_escape_radius)
 
     hue = np.power(i / max_iteration * 360, 1.5) % 255
     value = np.round(255)
@@ -107,10 +112,10 @@ def grayscale(**kwargs):
     iteration = kwargs['iteration']
     smooth = kwargs['smooth']
     final = kwargs['final']
-    escape_radius = kwargs['escape_radius']
+    log2_log2_escape_radius = kwargs['log2_log2_escape_radius']
 
     if iteration != max_iteration and smooth:
-        iteration = continous_dwell(final[0], final[1], iteration, escape_radius)
+        iteration = continous_dwell(final[0], final[1], iteration, log2_log2_escape_radius)
 
     s = np.sqrt(iteration / max_iteration)
 
@@ -189,3 +194,202 @@ color_scheme = [
     )
 
 ]
+
+def continous_dwell_batch(x, y, dwell, escape_radius=2):
+    """
+    Vectorized continuous dwell over arrays of final coordinates and dwell values.
+
+    Parameters:
+    - x (np.ndarray): The x-coordinates of the final points.
+    - y (np.ndarray): The y-coordinates of the final points.
+    - dwell (np.ndarray): The dwell values (iteration counts).
+    - escape_radius (float): The escape radius for determining if a point is in the Mandelbrot set.
+
+    Returns:
+    np.ndarray: Continuous dwell values.
+    """
+
+    return dwell - np.log2(np.log2(x * x + y * y)) + np.log2(np.log2(escape_radius)) + 1
+
+
+def grayscale_batch(**kwargs):
+    """
+    Batch grayscale coloring over whole iteration arrays.
+
+    Parameters:
+    - kwargs (dict): Keyword arguments containing Mandelbrot set parameter arrays.
+
+    Returns:
+    np.ndarray: (..., 3) uint8 RGB color values.
+    """
+
+    max_iteration = kwargs['max_iteration']
+    iteration = kwargs['iteration']
+    smooth = kwargs['smooth']
+    x, y = kwargs['final']
+    escape_radius = kwargs['escape_radius']
+
+    i = iteration.astype(np.float64)
+
+    if smooth:
+        escaped = iteration != max_iteration
+        i[escaped] = continous_dwell_batch(x[escaped], y[escaped], iteration[escaped], escape_radius)
+
+    s = np.round(np.sqrt(i / max_iteration) * 255)
+
+    return np.stack((s, s, s), axis=-1).astype(np.uint8)
+
+
+def simple_hsv_batch(**kwargs):
+    """
+    Batch HSV coloring over whole iteration arrays.
+
+    Parameters:
+    - kwargs (dict): Keyword arguments containing Mandelbrot set parameter arrays.
+
+    Returns:
+    np.ndarray: (..., 3) uint8 HSV color values.
+    """
+
+    max_iteration = kwargs['max_iteration']
+    iteration = kwargs['iteration']
+    smooth = kwargs['smooth']
+    x, y = kwargs['final']
+    escape_radius = kwargs['escape_radius']
+
+    escaped = iteration != max_iteration
+
+    i = iteration.astype(np.float64)
+
+    if smooth:
+        i[escaped] = continous_dwell_batch(x[escaped], y[escaped], iteration[escaped], escape_radius)
+
+    out = np.empty(iteration.shape + (3,), dtype=np.uint8)
+    out[..., 0] = 255
+    out[..., 1] = 255
+    out[..., 2] = 0
+
+    out[escaped, 0] = np.power(i[escaped] / max_iteration * 360, 1.5) % 255
+    out[escaped, 2] = 255
+
+    return out
+
+
+def quilt_coloring_batch(**kwargs):
+    """
+    Batch quilt coloring over whole iteration arrays.
+
+    Parameters:
+    - kwargs (dict): Keyword arguments containing Mandelbrot set parameter arrays.
+
+    Returns:
+    np.ndarray: (..., 3) uint8 HSV color values.
+    """
+
+    iteration = kwargs['iteration']
+    max_iteration = kwargs['max_iteration']
+    distance_estimate = kwargs['distance_estimate']
+    smooth = kwargs['smooth']
+    x, y = kwargs['final']
+
+    out = np.empty(iteration.shape + (3,), dtype=np.uint8)
+    out[..., 0] = 255
+    out[..., 1] = 255
+    out[..., 2] = 0
+
+    m = iteration != max_iteration
+
+    it = iteration[m].astype(np.float64)
+    xm = x[m]
+    ym = y[m]
+
+    fin_angle = np.arctan2(ym, xm)
+    fin_radius = continous_dwell_batch(xm, ym, it) - it if smooth else np.zeros_like(it)
+
+    dscale = np.log2(distance_estimate[m] / 0.00001)
+    value = np.clip((8 + dscale) / 8, 0.0, 1.0)
+
+    p = np.log(it) / np.log(100000)
+
+    lower = p < 0.5
+    p = np.where(lower, 1.0 - 1.5 * p, 1.5 * p - 0.5)
+    angle = np.where(lower, 1 - p, p)
+    radius = np.sqrt(p)
+
+    even = iteration[m] % 2 == 0
+    value[even] *= 0.85
+    radius[even] *= 0.667
+
+    angle[fin_angle < 0] += 0.02
+    angle += 0.0001 * fin_radius
+
+    hue = angle * 10.0
+    hue = hue - np.floor(hue)
+
+    saturation = radius - np.floor(radius)
+
+    out[m, 0] = np.round(hue * 255)
+    out[m, 1] = np.round(saturation * 255)
+    out[m, 2] = np.round(value * 255)
+
+    return out
+
+
+def generate_colormap_coloring_batch(colormap, exponetial_cyclic=True):
+    """
+    Generate a batch colormap coloring function over whole iteration arrays.
+
+    Parameters:
+    - colormap (list): A list of colors for the colormap.
+    - exponetial_cyclic (bool): Whether to apply exponential cyclic mapping.
+
+    Returns:
+    function: The batch colormap coloring function.
+    """
+
+    colormap_arr = np.asarray(colormap, dtype=np.uint8)
+    N = len(colormap)
+
+    def colormap_coloring_batch(**kwargs):
+        """
+        Batch colormap coloring function for whole iteration arrays.
+
+        Parameters:
+        - kwargs (dict): Keyword arguments containing Mandelbrot set parameter arrays.
+
+        Returns:
+        np.ndarray: (..., 3) uint8 RGB color values.
+        """
+
+        iteration = kwargs['iteration']
+        max_iteration = kwargs['max_iteration']
+        escape_radius = kwargs['escape_radius']
+        smooth = kwargs['smooth']
+        x, y = kwargs['final']
+
+        i = iteration.astype(np.float64)
+
+        if smooth:
+            escaped = iteration != max_iteration
+            i[escaped] = continous_dwell_batch(x[escaped], y[escaped], iteration[escaped], escape_radius)
+
+        if exponetial_cyclic:
+            idx = (np.power(i / max_iteration, 2) * N % N).astype(np.int64)
+        else:
+            idx = np.minimum(i % N, i % max_iteration).astype(np.int64)
+
+        return colormap_arr[idx]
+
+    return colormap_coloring_batch
+
+
+batch_color_scheme = {
+    grayscale: grayscale_batch,
+    simple_hsv: simple_hsv_batch,
+    quilt_coloring: quilt_coloring_batch,
+}
+
+# Schemes that actually read the distance estimate. Producing it costs a log, a sqrt and a
+# divide per escaping point, so callers consult this set and skip the computation for every
+# other scheme.
+needs_distance_estimate = {quilt_coloring}
@@ -1,12 +1,16 @@
+import math
+import os
 import time
 from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 
 import numpy as np
 from PIL import Image, ImageDraw
 
-from .coloring import color_scheme, generate_colormap_coloring
-from quadtree import QuadTree
-from .util import calculate_quadtree, calculated_mixed_raster_quadtree, row_raster
+from .coloring import color_scheme, generate_colormap_coloring, batch_color_scheme, needs_distance_estimate
+from quadtree import build_quadtree
+from .util import calculate_quadtree_level, calculated_mixed_raster_level, row_raster, in_main_body_vec, \
+    reference_orbit, calculate_perturbation
 
 import matplotlib.cm
 
@@ -48,7 +52,9 @@ class Mandelbrot:
         height = scale * size[1]
         offset = center + np.array([-width, height]) / 2
 
-        self.quad_tree = QuadTree(np.zeros(2, dtype=np.int32), np.array([size[0], size[1]], dtype=np.int32))
+        # Copy of the per-shape template: the root quadrant split is shared across renders of
+        # one size, while deeper splits stay private to this frame.
+        self.quad_tree = build_quadtree(size[0], size[1]).copy()
 
         self.x = np.linspace(0, size[0], num=size[0], dtype=np.float64) * scale + offset[0]
         self.y = np.linspace(0, size[1], num=size[1], dtype=np.float64) * -scale + offset[1]
@@ -57,14 +63,21 @@ class Mandelbrot:
 
         # self.x, self.y = np.meshgrid(self.x, self.y)
 
-        self.pixels = np.zeros((size[1], size[0], 3), dtype=np.uint8) if not mixed_raster or not raster else np.ones(
-            (size[1], size[0], 3), dtype=np.uint8) * -1
+        self.pixels = np.empty((size[1], size[0], 3), dtype=np.uint8)
+
+        # Dense per-pixel caches: seen flags a pixel as computed (pixels holds its color) and
+        # in_set records its membership, so shared box borders are reused by flat array
+        # lookups instead of a dict keyed on coordinate tuples.
+        self.seen = np.zeros((size[1], size[0]), dtype=bool)
+        self.in_set = np.zeros((size[1], size[0]), dtype=bool)
 
         self.color_scheme, self.color_mode = color
+        self.batch_color_scheme = batch_color_scheme.get(self.color_scheme)
         self.smooth = smooth
 
         self.escape_radius = escape_radius
         self.escape_radius_squared = escape_radius * escape_radius
+        self.log2_log2_escape_radius = math.log2(math.log2(escape_radius))
 
         self.raster = raster
         self.mixed_raster = mixed_raster
@@ -81,65 +94,227 @@ class Mandelbrot:
         Generates the Mandelbrot set based on the configured parameters.
         """
         if self.raster:
-            memo = {}
-            for i in range(self.size[1]):
-                row_raster(self.pixels, i, self.x, self.y, self.max_iterations,
-                           self.escape_radius,
-                           self.smooth,
-                           self.color_scheme,
-                           self.num_computed,
-                           self.period_checking, memo)
+            # Below this width the FP64 pixel coordinates collapse onto each other, so the
+            # direct iteration is replaced by perturbation against a high-precision
+            # reference orbit.
+            if self.width < 1e-10:
+                self._generate_raster_perturbation()
+            else:
+                self._generate_raster_vectorized()
         elif self.mixed_raster:
-            memo = dict()
-            self.quad_tree.split(boundary=0)
-            queue: deque[QuadTree] = deque(self.quad_tree.children)
+            queue: deque[int] = deque(self.quad_tree.children(0))
+
+            # The boxes of a BFS level and the raster rows are independent, so both are spread
+            # across a thread pool; the heavy lifting happens inside NumPy ufuncs that release
+            # the GIL, so the threads run concurrently.
+            executor = ThreadPoolExecutor(max_workers=os.cpu_count())
 
             while queue:
-                quad_tree = queue.popleft()
-
-                split, border = calculated_mixed_raster_quadtree(quad_tree, self.pixels, self.x, self.y,
-                                                                 self.max_iterations,
-                                                                 self.escape_radius,
-                                                                 self.smooth,
-                                                                 self.color_scheme,
-                                                                 self.num_computed,
-                                                                 self.period_checking, memo)
-
-                if split:
-                    quad_tree.split()
-                    for child in quad_tree.children:
-                        queue.append(child)
-                else:
-                    quad_tree.fill_array(self.pixels, border)
-
-            for i in range(self.size[1]):
-                row_raster(self.pixels, i, self.x, self.y, self.max_iterations,
-                           self.escape_radius,
-                           self.smooth,
-                           self.color_scheme,
-                           self.num_computed,
-                           self.period_checking, memo)
+                level = list(queue)
+                queue.clear()
+
+                results = calculated_mixed_raster_level(self.quad_tree, level, self.pixels, self.seen, self.in_set,
+                                                        self.x, self.y,
+                                                        self.max_iterations,
+                                                        self.escape_radius,
+                                                        self.smooth,
+                                                        self.color_scheme,
+                                                        self.num_computed,
+                                                        self.period_checking,
+                                                        log2_log2_escape_radius=self.log2_log2_escape_radius,
+                                                        executor=executor)
+
+                # Non-split boxes are gathered and filled in one pass after the level: each
+                # assignment is a single NumPy rectangle broadcast, without the per-node
+                # fill_array dispatch.
+                fills = []
+
+                for node, (split, in_set, border) in zip(level, results):
+                    if split:
+                        queue.extend(self.quad_tree.split(node))
+                    elif in_set:
+                        fills.append((self.quad_tree.tl(node), self.quad_tree.br(node), border))
+
+                for tl, br, border in fills:
+                    self.pixels[tl[1] + 1:br[1] - 1, tl[0] + 1:br[0] - 1] = border
+                    self.seen[tl[1] + 1:br[1] - 1, tl[0] + 1:br[0] - 1] = True
+                    self.in_set[tl[1] + 1:br[1] - 1, tl[0] + 1:br[0] - 1] = True
+
+            def fill_row(row):
+                return row_raster(self.pixels, self.seen, row, self.x, self.y, self.max_iterations,
+                                  self.escape_radius,
+                                  self.smooth,
+                                  self.color_scheme,
+                                  self.num_computed,
+                                  self.period_checking,
+                                  log2_log2_escape_radius=self.log2_log2_escape_radius)
+
+            list(executor.map(fill_row, range(self.size[1])))
+            executor.shutdown()
         else:
-            memo = {}
-            self.quad_tree.split(boundary=0)
-            queue: deque[QuadTree] = deque(self.quad_tree.children)
+            queue: deque[int] = deque(self.quad_tree.children(0))
+
+            executor = ThreadPoolExecutor(max_workers=os.cpu_count())
 
             while queue:
-                quad_tree = queue.popleft()
+                level = list(queue)
+                queue.clear()
 
-                split, border = calculate_quadtree(quad_tree, self.pixels, self.x, self.y, self.max_iterations,
+                results = calculate_quadtree_level(self.quad_tree, level, self.pixels, self.seen, self.x, self.y,
+                                                   self.max_iterations,
                                                    self.escape_radius,
                                                    self.smooth,
                                                    self.color_scheme,
                                                    self.num_computed,
-                                                   self.period_checking, memo)
+                                                   self.period_checking,
+                                                   log2_log2_escape_radius=self.log2_log2_escape_radius,
+                                                   executor=executor)
+
+                fills = []
+
+                for node, (split, border) in zip(level, results):
+                    if split:
+                        queue.extend(self.quad_tree.split(node))
+                    else:
+                        fills.append((self.quad_tree.tl(node), self.quad_tree.br(node), border))
+
+                for tl, br, border in fills:
+                    self.pixels[tl[1] + 1:br[1] - 1, tl[0] + 1:br[0] - 1] = border
+
+            executor.shutdown()
+
+    def _generate_raster_vectorized(self):
+        """
+        Generates the raster image by iterating the whole grid at once with NumPy.
+
+        The iteration state lives in full (H, W) complex arrays and an `alive` mask; each step
+        advances only the still-alive points, so the per-pixel Python dispatch of the row raster is
+        replaced by whole-array arithmetic. Points in the main cardioid or the period-2 bulb are
+        marked dead up front since they never escape.
+        """
+
+        C = self.x[None, :] + 1j * self.y[:, None]
+        Z = np.zeros_like(C)
+        dZ = np.zeros_like(C)
+        iters = np.full(C.shape, self.max_iterations, dtype=np.int32)
+        alive = np.ones(C.shape, dtype=bool)
+
+        alive[in_main_body_vec(C.real, C.imag)] = False
+
+        for k in range(self.max_iterations):
+            if not alive.any():
+                break
+
+            Zt = Z[alive]
+            dZt = dZ[alive]
+
+            Zt = Zt * Zt + C[alive]
+            dZt = 2 * Zt * dZt + 1
+
+            escaped = Zt.real * Zt.real + Zt.imag * Zt.imag > self.escape_radius_squared
+
+            Z[alive] = Zt
+            dZ[alive] = dZt
+            iters.flat[np.flatnonzero(alive)[escaped]] = k + 1
+            alive[alive] = ~escaped
+
+        # The distance estimate costs a log, a sqrt and a divide per escaping point, so it is
+        # only produced for the schemes that read it.
+        needs_de = self.color_scheme in needs_distance_estimate
+
+        if needs_de:
+            z = Z.real * Z.real + Z.imag * Z.imag
+            dz = dZ.real * dZ.real + dZ.imag * dZ.imag
+
+        if self.batch_color_scheme is not None:
+            distance_estimate = None
+
+            if needs_de:
+                escaped = iters != self.max_iterations
+                distance_estimate = np.full(C.shape, np.nan)
+                distance_estimate[escaped] = np.log(z[escaped]) * np.sqrt(z[escaped] / dz[escaped])
+
+            self.pixels[:] = self.batch_color_scheme(max_iteration=self.max_iterations,
+                                                     iteration=iters,
+                                                     distance_estimate=distance_estimate,
+                                                     final=(Z.real, Z.imag),
+                                                     escape_radius=self.escape_radius,
+                                                     smooth=self.smooth)
+            return
+
+        for j in range(self.size[1]):
+            for i in range(self.size[0]):
+                iteration = int(iters[j, i])
+
+                distance_estimate = None
+                if needs_de and iteration != self.max_iterations:
+                    distance_estimate = math.log(z[j, i]) * math.sqrt(z[j, i] / dz[j, i])
+
+                self.pixels[j, i] = self.color_scheme(max_iteration=self.max_iterations,
+                                                      iteration=iteration,
+                                                      distance_estimate=distance_estimate,
+                                                      final=(Z[j, i].real, Z[j, i].imag),
+                                                      escape_radius=self.escape_radius,
+                                                      log2_log2_escape_radius=self.log2_log2_escape_radius,
+                                                      smooth=self.smooth)
+
+    def _generate_raster_perturbation(self):
+        """
+        Generates the raster image by perturbation against a high-precision reference orbit.
+
+        One orbit at the view center is iterated in arbitrary precision by reference_orbit; every
+        pixel then evolves only its FP64 offset from that orbit in calculate_perturbation, which
+        keeps full precision at zooms where the absolute coordinates have run out of mantissa
+        bits. The coloring tail matches the vectorized raster.
+        """
+
+        x0 = float(self.x[self.size[0] // 2])
+        y0 = float(self.y[self.size[1] // 2])
+
+        orbit = reference_orbit(x0, y0, self.max_iterations, self.escape_radius_squared)
+
+        dc = (self.x - x0)[None, :] + 1j * (self.y - y0)[:, None]
+
+        iters, zx, zy, dzx, dzy = calculate_perturbation(dc, orbit, self.max_iterations,
+                                                         self.escape_radius_squared)
+
+        needs_de = self.color_scheme in needs_distance_estimate
+
+        if needs_de:
+            z = zx * zx + zy * zy
+            dz = dzx * dzx + dzy * dzy
+
+        if self.batch_color_scheme is not None:
+            distance_estimate = None
+
+            if needs_de:
+                escaped = iters != self.max_iterations
+                distance_estimate = np.full(dc.shape, np.nan)
+                distance_estimate[escaped] = np.log(z[escaped]) * np.sqrt(z[escaped] / dz[escaped])
+
+            self.pixels[:] = self.batch_color_scheme(max_iteration=self.max_iterations,
+                                                     iteration=iters,
+                                                     distance_estimate=distance_estimate,
+                                                     final=(zx, zy),
+                                                     escape_radius=self.escape_radius,
+                                                     smooth=self.smooth)
+            return
+
+        for j in range(self.size[1]):
+            for i in range(self.size[0]):
+                iteration = int(iters[j, i])
+
+                distance_estimate = None
+                if needs_de and iteration != self.max_iterations:
+                    distance_estimate = math.log(z[j, i]) * math.sqrt(z[j, i] / dz[j, i])
 
-                if split:
-                    quad_tree.split()
-                    for child in quad_tree.children:
-                        queue.append(child)
-                else:
-                    quad_tree.fill_array(self.pixels, border)
+                self.pixels[j, i] = self.color_scheme(max_iteration=self.max_iterations,
+                                                      iteration=iteration,
+                                                      distance_estimate=distance_estimate,
+                                                      final=(zx[j, i], zy[j, i]),
+                                                      escape_radius=self.escape_radius,
+                                                      log2_log2_escape_radius=self.log2_log2_escape_radius,
+                                                      smooth=self.smooth)
 
     def render(self, filename="image.png"):
         """
@@ -164,11 +339,10 @@ class Mandelbrot:
         - img (Image): The image object to draw on.
         """
         draw = ImageDraw.Draw(img)
-        queue: deque[QuadTree] = deque([self.quad_tree])
+        queue: deque[int] = deque([0])
 
         while queue:
-            quad_tree = queue.popleft()
-            draw.rectangle(((quad_tree.tl[0], quad_tree.tl[1]), (quad_tree.br[0], quad_tree.br[1])), outline="red")
+            node = queue.popleft()
+            draw.rectangle((self.quad_tree.tl(node), self.quad_tree.br(node)), outline="red")
 
-            for child in quad_tree.children:
-                queue.append(child)
\ No newline at end of file
+            queue.extend(self.quad_tree.children(node))
\ No newline at end of file
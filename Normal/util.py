@@ -1,22 +1,55 @@
+import math
+from decimal import Decimal, localcontext
+
 import numpy as np
 
-from quadtree import QuadTree
+from quadtree import QuadTreeFlat
+
+from .coloring import batch_color_scheme, needs_distance_estimate
+
+# Shared read-only sentinel returned by the mixed walker when no border point lies in the set;
+# hoisted to module scope so the walker does not allocate a fresh triple per box.
+unfilled_color = np.array([-1.0, -1.0, -1.0])
+unfilled_color.setflags(write=False)
 
 
 def in_main_body(x, y):
     """
-    Checks if the given point (x, y) is inside the main cardioid of the Mandelbrot set.
+    Checks if the given point (x, y) is inside the main cardioid or the period-2 bulb of the
+    Mandelbrot set.
 
     Parameters:
     - x (float): The x-coordinate of the point.
     - y (float): The y-coordinate of the point.
 
     Returns:
-    bool: True if the point is inside the main cardioid, False otherwise.
+    bool: True if the point is inside the main cardioid or the period-2 bulb, False otherwise.
+    """
+
+    dx = x - 0.25
+    y2 = y * y
+    q = dx * dx + y2
+
+    return q * (q + dx) <= 0.25 * y2 or (x + 1) * (x + 1) + y2 < 0.0625
+
+
+def in_main_body_vec(x_vals, y_vals):
+    """
+    Vectorized in_main_body: tests whole coordinate arrays against the main cardioid and the
+    period-2 bulb (x + 1)^2 + y^2 < 1/16 in one contiguous NumPy pass, so the iteration loops
+    start with the densest interior regions already culled.
+
+    Parameters:
+    - x_vals: The x-coordinates of the points (array or scalar).
+    - y_vals: The y-coordinates of the points (array or scalar).
+
+    Returns:
+    np.ndarray: Boolean mask of points that lie inside either region.
     """
 
-    q = (x - 0.25) * (x - 0.25) + y * y
-    return q * (q + x - 0.25) <= 0.25 * y * y
+    q = (x_vals - 0.25) ** 2 + y_vals ** 2
+    return (q * (q + x_vals - 0.25) <= 0.25 * y_vals ** 2) \
+        | ((x_vals + 1) ** 2 + y_vals ** 2 < 0.0625)
 
 
 def calculate(x0,
@@ -27,7 +60,7 @@ def calculate(x0,
               color_scheme,
               num_computed,
               period_checking,
-              memo=None):
+              log2_log2_escape_radius=None):
     """
     Performs Mandelbrot set iteration to calculate the color of a given point.
 
@@ -40,25 +73,24 @@ def calculate(x0,
     - color_scheme (function): A function that maps Mandelbrot set parameters to a color.
     - num_computed (int): The number of points already computed.
     - period_checking (bool): Whether to perform periodicity checking.
-    - memo (dict): A memoization dictionary for caching computed points.
+    - log2_log2_escape_radius (float): Precomputed log2(log2(escape_radius)); derived from
+      escape_radius when not supplied.
 
     Returns:
     Tuple[np.ndarray, bool]: A tuple containing the calculated color and a boolean indicating if the point is in the set.
     """
 
-    if memo is not None and (x0, y0) in memo:
-        return memo[(x0, y0)]
+    if log2_log2_escape_radius is None:
+        log2_log2_escape_radius = math.log2(math.log2(escape_radius))
 
     num_computed += 1
 
     if in_main_body(x0, y0):
         color = color_scheme(max_iteration=max_iterations, iteration=max_iterations,
                              distance_estimate=None, final=(x0, y0), escape_radius=escape_radius,
+                             log2_log2_escape_radius=log2_log2_escape_radius,
                              smooth=smooth)
 
-        if memo is not None:
-            memo[(x0, y0)] = (color, True)
-
         return color, True
 
     x = 0
@@ -69,14 +101,15 @@ def calculate(x0,
 
     x_old = 0
     y_old = 0
-    period = 0
 
     dx = 0
     dy = 0
 
     iterations = 0
 
-    escape_radius_squared = escape_radius * escape_radius
+    # Escape is guaranteed once |z| > 2, so the default radius's square is the constant 4.0
+    # rather than a recomputed product.
+    escape_radius_squared = 4.0 if escape_radius == 2.0 else escape_radius * escape_radius
 
     while x2 + y2 <= escape_radius_squared and iterations < max_iterations:
         x = x2 - y2 + x0
@@ -95,32 +128,111 @@ def calculate(x0,
             if x_old == x and y_old == y:
                 iterations = max_iterations
                 break
-            period += 1
 
-            if period > 20:
-                period = 0
+            # Snapshot every 32 iterations: the bitmask test replaces the period counter's
+            # increment, compare and reset with a single AND against the loop index.
+            if iterations & 31 == 0:
                 x_old = x
                 y_old = y
 
-    z = x2 + y2
-    dz = dx * dx + dy * dy
+    distance_estimate = None
 
-    distance_estimate = np.log(
-        z) * np.sqrt(z / dz) if iterations != max_iterations else None
+    if iterations != max_iterations and color_scheme in needs_distance_estimate:
+        z = x2 + y2
+        dz = dx * dx + dy * dy
+        # math.log/math.sqrt skip NumPy's array dispatch on these plain float scalars.
+        distance_estimate = math.log(z) * math.sqrt(z / dz)
 
     color = color_scheme(max_iteration=max_iterations,
                          iteration=iterations,
                          distance_estimate=distance_estimate,
                          final=(x, y),
-                         escape_radius=escape_radius, smooth=smooth)
+                         escape_radius=escape_radius,
+                         log2_log2_escape_radius=log2_log2_escape_radius,
+                         smooth=smooth)
 
-    if memo is not None:
-        memo[(x0, y0)] = (color, iterations == max_iterations)
     return color, iterations == max_iterations
 
 
-def calculate_quadtree(quad_tree: QuadTree,
+def calculate_segment(x_vals, y_vals, max_iterations, escape_radius, smooth, color_scheme,
+                      log2_log2_escape_radius=None):
+    """
+    Computes colors and set membership for one border segment in a single batched dispatch.
+
+    The coordinates are slice views of the precomputed grid arrays, so a row (x slice, y scalar)
+    and a column (x scalar, y slice) both run through calculate_row's whole-array iteration
+    without any per-call coordinate construction.
+
+    Parameters:
+    - x_vals: The x-coordinates of the segment (slice view or scalar).
+    - y_vals: The y-coordinates of the segment (slice view or scalar).
+    - max_iterations (int): The maximum number of iterations.
+    - escape_radius (float): The escape radius for determining if a point is in the Mandelbrot set.
+    - smooth (bool): Whether to use smooth coloring.
+    - color_scheme (function): A function that maps Mandelbrot set parameters to a color.
+    - log2_log2_escape_radius (float): Precomputed log2(log2(escape_radius)); derived from
+      escape_radius when not supplied.
+
+    Returns:
+    Tuple[np.ndarray, np.ndarray]: The segment's colors, one row per lane, and a boolean mask of
+                                   lanes that lie in the Mandelbrot set.
+    """
+
+    if log2_log2_escape_radius is None:
+        log2_log2_escape_radius = math.log2(math.log2(escape_radius))
+
+    iters, zx, zy, dzx, dzy = calculate_row(x_vals, y_vals, max_iterations,
+                                            escape_radius * escape_radius)
+
+    in_set = iters == max_iterations
+
+    needs_de = color_scheme in needs_distance_estimate
+
+    if needs_de:
+        z = zx * zx + zy * zy
+        dz = dzx * dzx + dzy * dzy
+
+    batch = batch_color_scheme.get(color_scheme)
+
+    if batch is not None:
+        distance_estimate = None
+
+        if needs_de:
+            escaped = ~in_set
+            distance_estimate = np.full(iters.shape, np.nan)
+            distance_estimate[escaped] = np.log(z[escaped]) * np.sqrt(z[escaped] / dz[escaped])
+
+        colors = batch(max_iteration=max_iterations,
+                       iteration=iters,
+                       distance_estimate=distance_estimate,
+                       final=(zx, zy),
+                       escape_radius=escape_radius,
+                       smooth=smooth)
+    else:
+        colors = np.empty((iters.shape[0], 3), dtype=np.uint8)
+
+        for k in range(iters.shape[0]):
+            iteration = int(iters[k])
+
+            distance_estimate = None
+            if needs_de and iteration != max_iterations:
+                distance_estimate = math.log(z[k]) * math.sqrt(z[k] / dz[k])
+
+            colors[k] = color_scheme(max_iteration=max_iterations,
+                                     iteration=iteration,
+                                     distance_estimate=distance_estimate,
+                                     final=(zx[k], zy[k]),
+                                     escape_radius=escape_radius,
+                                     log2_log2_escape_radius=log2_log2_escape_radius,
+                                     smooth=smooth)
+
+    return colors, in_set
+
+
+def calculate_quadtree(tree: QuadTreeFlat,
+                       node: int,
                        pixels: np.ndarray,
+                       seen: np.ndarray,
                        x: np.ndarray,
                        y: np.ndarray,
                        max_iterations,
@@ -129,13 +241,23 @@ def calculate_quadtree(quad_tree: QuadTree,
                        color_scheme,
                        num_computed,
                        period_checking,
-                       memo=None):
+                       log2_log2_escape_radius=None):
     """
-    Calculates the Mandelbrot set for a given QuadTree region.
+    Calculates the Mandelbrot set for one quadtree node region.
+
+    The four border edges are gathered into one lane batch and handed to calculate_segment in a
+    single dispatch, so the walk costs one batched call per box instead of one per border
+    pixel. The seen mask is the point cache: border pixels shared with an already-walked sibling
+    are skipped by masking their lanes out of the batch, and every computed pixel is marked so
+    later boxes reuse it. Coordinates live on a fixed grid, so the flat (H, W) flag array gives
+    O(1) hits with none of the tuple hashing of a dict keyed on (x, y). The split test compares
+    the stored border pixels against the top-left pixel with whole-array compares.
 
     Parameters:
-    - quad_tree (QuadTree): The QuadTree region to calculate.
+    - tree (QuadTreeFlat): The flat quadtree holding the node rows.
+    - node (int): Index of the node region to calculate.
     - pixels (np.ndarray): The pixel array to store the calculated colors.
+    - seen (np.ndarray): Boolean mask of pixels that have already been computed.
     - x (np.ndarray): The x-coordinates of the points.
     - y (np.ndarray): The y-coordinates of the points.
     - max_iterations (int): The maximum number of iterations.
@@ -143,83 +265,102 @@ def calculate_quadtree(quad_tree: QuadTree,
     - smooth (bool): Whether to use smooth coloring.
     - color_scheme (function): A function that maps Mandelbrot set parameters to a color.
     - num_computed (int): The number of points already computed.
-    - period_checking (bool): Whether to perform periodicity checking.
-    - memo (dict): A memoization dictionary for caching computed points.
+    - period_checking (bool): Whether to perform periodicity checking; unused here, since in-set
+      border lanes simply run calculate_row to max_iterations.
+    - log2_log2_escape_radius (float): Precomputed log2(log2(escape_radius)) for the render.
 
     Returns:
-    Tuple[bool, np.ndarray]: A tuple containing a boolean indicating if the QuadTree region is splittable
+    Tuple[bool, np.ndarray]: A tuple containing a boolean indicating if the node region is splittable
                              and the border color if not splittable.
     """
 
-    tl = quad_tree.tl
-    br = quad_tree.br
-
-    if quad_tree.rows == 1 and quad_tree.cols == 1:
-        color, _ = calculate(x[tl[0]], y[tl[1]], max_iterations, escape_radius, smooth, color_scheme, num_computed,
-                             period_checking, memo)
-        return False, color
-
-    split = False
-    border = None
+    tl0, tl1 = tree.tl(node)
+    br0, br1 = tree.br(node)
 
-    for i in range(tl[0], br[0]):
-        if border is not None:
-            top_color, _ = calculate(x[i], y[tl[1]], max_iterations, escape_radius, smooth, color_scheme, num_computed,
-                                     period_checking, memo)
+    if br1 - tl1 == 1 and br0 - tl0 == 1:
+        if seen[tl1, tl0]:
+            return False, pixels[tl1, tl0].copy()
 
-            if not split:
-                split |= (border != top_color).any()
+        color, _ = calculate(x[tl0], y[tl1], max_iterations, escape_radius, smooth, color_scheme, num_computed,
+                             period_checking, log2_log2_escape_radius=log2_log2_escape_radius)
 
-            pixels[tl[1]][i] = top_color
-
-            bottom_color, _ = calculate(x[i], y[br[1] - 1], max_iterations, escape_radius, smooth, color_scheme,
-                                        num_computed, period_checking, memo)
-            if not split:
-                split |= (border != bottom_color).any()
-
-            pixels[br[1] - 1][i] = bottom_color
-        else:
-            top_color, _ = calculate(x[i], y[tl[1]], max_iterations, escape_radius, smooth, color_scheme, num_computed,
-                                     period_checking, memo)
-            pixels[tl[1]][i] = top_color
-            border = top_color
-
-            bottom_color, _ = calculate(x[i], y[br[1] - 1], max_iterations, escape_radius, smooth, color_scheme,
-                                        num_computed, period_checking, memo)
-            split |= (border != bottom_color).any()
-            pixels[br[1] - 1][i] = bottom_color
-
-    for j in range(tl[1], br[1]):
-        left_color, _ = calculate(x[tl[0]], y[j], max_iterations, escape_radius, smooth, color_scheme, num_computed,
-                                  period_checking, memo)
-        pixels[j][tl[0]] = left_color
-
-        if not split:
-            split |= (left_color != border).any()
-
-        right_color, _ = calculate(x[br[0] - 1], y[j], max_iterations, escape_radius, smooth, color_scheme,
-                                   num_computed, period_checking, memo)
-        pixels[j][br[0] - 1] = right_color
-
-        if not split:
-            split |= (right_color != border).any()
-
-    return split and quad_tree.cols > 3 and quad_tree.rows > 3, border
+        pixels[tl1][tl0] = color
+        seen[tl1][tl0] = True
 
+        return False, color
 
-def calculated_mixed_raster_quadtree(quad_tree: QuadTree, pixels: np.ndarray, x: np.ndarray, y: np.ndarray,
+    top = pixels[tl1, tl0:br0]
+    bottom = pixels[br1 - 1, tl0:br0]
+    left = pixels[tl1:br1, tl0]
+    right = pixels[tl1:br1, br0 - 1]
+
+    top_seen = seen[tl1, tl0:br0]
+    bottom_seen = seen[br1 - 1, tl0:br0]
+    left_seen = seen[tl1:br1, tl0]
+    right_seen = seen[tl1:br1, br0 - 1]
+
+    idx_top = np.flatnonzero(~top_seen)
+    idx_bottom = np.flatnonzero(~bottom_seen)
+    idx_left = np.flatnonzero(~left_seen)
+    idx_right = np.flatnonzero(~right_seen)
+
+    # All four edges are fused into one lane batch, so the whole border costs a single
+    # calculate_segment dispatch instead of one per edge.
+    if idx_top.size or idx_bottom.size or idx_left.size or idx_right.size:
+        xs = np.concatenate((x[tl0:br0][idx_top],
+                             x[tl0:br0][idx_bottom],
+                             np.full(idx_left.size, x[tl0]),
+                             np.full(idx_right.size, x[br0 - 1])))
+        ys = np.concatenate((np.full(idx_top.size, y[tl1]),
+                             np.full(idx_bottom.size, y[br1 - 1]),
+                             y[tl1:br1][idx_left],
+                             y[tl1:br1][idx_right]))
+
+        colors, _ = calculate_segment(xs, ys, max_iterations, escape_radius,
+                                      smooth, color_scheme, log2_log2_escape_radius)
+
+        n0 = idx_top.size
+        n1 = n0 + idx_bottom.size
+        n2 = n1 + idx_left.size
+
+        top[idx_top] = colors[:n0]
+        bottom[idx_bottom] = colors[n0:n1]
+        left[idx_left] = colors[n1:n2]
+        right[idx_right] = colors[n2:]
+
+        top_seen[idx_top] = True
+        bottom_seen[idx_bottom] = True
+        left_seen[idx_left] = True
+        right_seen[idx_right] = True
+
+    border = pixels[tl1, tl0].copy()
+
+    split = bool((top != border).any()
+                 or (bottom != border).any()
+                 or (left != border).any()
+                 or (right != border).any())
+
+    return split and br0 - tl0 > 3 and br1 - tl1 > 3, border
+
+
+def calculated_mixed_raster_quadtree(tree: QuadTreeFlat, node: int, pixels: np.ndarray, seen: np.ndarray,
+                                     in_set: np.ndarray,
+                                     x: np.ndarray, y: np.ndarray,
                                      max_iterations,
                                      escape_radius,
                                      smooth,
                                      color_scheme,
                                      num_computed,
-                                     period_checking, memo=None):
+                                     period_checking, log2_log2_escape_radius=None):
     """
     Calculates the Mandelbrot set using a mixed raster and quadtree approach.
 
     Parameters:
-    - quad_tree (QuadTree): The QuadTree region to calculate.
+    - tree (QuadTreeFlat): The flat quadtree holding the node rows.
+    - node (int): Index of the node region to calculate.
     - pixels (np.ndarray): The pixel array to store the calculated colors.
+    - seen (np.ndarray): Boolean mask of pixels that have already been computed.
+    - in_set (np.ndarray): Boolean mask of computed pixels that lie in the Mandelbrot set.
     - x (np.ndarray): The x-coordinates of the points.
     - y (np.ndarray): The y-coordinates of the points.
     - max_iterations (int): The maximum number of iterations.
@@ -227,98 +368,339 @@ def calculated_mixed_raster_quadtree(quad_tree: QuadTree, pixels: np.ndarray, x:
     - smooth (bool): Whether to use smooth coloring.
     - color_scheme (function): A function that maps Mandelbrot set parameters to a color.
     - num_computed (int): The number of points already computed.
-    - period_checking (bool): Whether to perform periodicity checking.
-    - memo (dict): A memoization dictionary for caching computed points.
+    - period_checking (bool): Whether to perform periodicity checking; unused here, since in-set
+      border lanes simply run calculate_row to max_iterations.
+    - log2_log2_escape_radius (float): Precomputed log2(log2(escape_radius)) for the render.
 
     Returns:
-    Tuple[bool, np.ndarray]: A tuple containing a boolean indicating if the QuadTree region is splittable
-                             and the border color if not splittable.
+    Tuple[bool, bool, np.ndarray]: A tuple containing a boolean indicating if the node region is
+                                   splittable, whether the whole border lies in the Mandelbrot set,
+                                   and the border color if not splittable.
+
+    The four border edges are gathered into one lane batch and handed to calculate_segment in a
+    single dispatch; membership comes back as a boolean mask per side, so the
+    isMandelbrot/hasMandelbrot bookkeeping reduces to all()/any() over the masks. The seen mask
+    is the point cache: pixels shared with an already-walked sibling are masked out of the batch
+    and their colors and memberships are read back from pixels and in_set — a flat O(1) grid
+    lookup instead of the old dict keyed on (x, y) tuples.
     """
 
-    tl = quad_tree.tl
-    br = quad_tree.br
+    tl0, tl1 = tree.tl(node)
+    br0, br1 = tree.br(node)
+
+    if br1 - tl1 == 1 and br0 - tl0 == 1:
+        if seen[tl1, tl0]:
+            return False, bool(in_set[tl1, tl0]), pixels[tl1, tl0].copy()
 
-    if quad_tree.rows == 1 and quad_tree.cols == 1:
-        color, _ = calculate(x[tl[0]], y[tl[1]], max_iterations,
+        color, inSet = calculate(x[tl0], y[tl1], max_iterations,
+                                 escape_radius,
+                                 smooth,
+                                 color_scheme,
+                                 num_computed,
+                                 period_checking, log2_log2_escape_radius=log2_log2_escape_radius)
+
+        pixels[tl1][tl0] = color
+        in_set[tl1][tl0] = inSet
+        seen[tl1][tl0] = True
+
+        return False, inSet, color
+
+    top_seen = seen[tl1, tl0:br0]
+    bottom_seen = seen[br1 - 1, tl0:br0]
+    left_seen = seen[tl1:br1, tl0]
+    right_seen = seen[tl1:br1, br0 - 1]
+
+    top_in = in_set[tl1, tl0:br0]
+    bottom_in = in_set[br1 - 1, tl0:br0]
+    left_in = in_set[tl1:br1, tl0]
+    right_in = in_set[tl1:br1, br0 - 1]
+
+    idx_top = np.flatnonzero(~top_seen)
+    idx_bottom = np.flatnonzero(~bottom_seen)
+    idx_left = np.flatnonzero(~left_seen)
+    idx_right = np.flatnonzero(~right_seen)
+
+    # All four edges are fused into one lane batch, so the whole border costs a single
+    # calculate_segment dispatch instead of one per edge.
+    if idx_top.size or idx_bottom.size or idx_left.size or idx_right.size:
+        xs = np.concatenate((x[tl0:br0][idx_top],
+                             x[tl0:br0][idx_bottom],
+                             np.full(idx_left.size, x[tl0]),
+                             np.full(idx_right.size, x[br0 - 1])))
+        ys = np.concatenate((np.full(idx_top.size, y[tl1]),
+                             np.full(idx_bottom.size, y[br1 - 1]),
+                             y[tl1:br1][idx_left],
+                             y[tl1:br1][idx_right]))
+
+        colors, lanes_in = calculate_segment(xs, ys, max_iterations, escape_radius,
+                                             smooth, color_scheme, log2_log2_escape_radius)
+
+        n0 = idx_top.size
+        n1 = n0 + idx_bottom.size
+        n2 = n1 + idx_left.size
+
+        pixels[tl1, tl0:br0][idx_top] = colors[:n0]
+        pixels[br1 - 1, tl0:br0][idx_bottom] = colors[n0:n1]
+        pixels[tl1:br1, tl0][idx_left] = colors[n1:n2]
+        pixels[tl1:br1, br0 - 1][idx_right] = colors[n2:]
+
+        top_in[idx_top] = lanes_in[:n0]
+        bottom_in[idx_bottom] = lanes_in[n0:n1]
+        left_in[idx_left] = lanes_in[n1:n2]
+        right_in[idx_right] = lanes_in[n2:]
+
+        top_seen[idx_top] = True
+        bottom_seen[idx_bottom] = True
+        left_seen[idx_left] = True
+        right_seen[idx_right] = True
+
+    isMandelbrot = bool(top_in.all() and bottom_in.all() and left_in.all() and right_in.all())
+    hasMandelbrot = bool(top_in.any() or bottom_in.any() or left_in.any() or right_in.any())
+
+    color = unfilled_color
+
+    for in_seg, row_slice, col_slice in ((top_in, tl1, slice(tl0, br0)),
+                                         (bottom_in, br1 - 1, slice(tl0, br0)),
+                                         (left_in, slice(tl1, br1), tl0),
+                                         (right_in, slice(tl1, br1), br0 - 1)):
+        if in_seg.any():
+            color = pixels[row_slice, col_slice][np.flatnonzero(in_seg)[0]].copy()
+            break
+
+    return isMandelbrot != hasMandelbrot and (br1 - tl1 > 3 and br0 - tl0 > 3), isMandelbrot, color
+
+
+def calculate_quadtree_level(tree: QuadTreeFlat, level, pixels: np.ndarray, seen: np.ndarray,
+                             x: np.ndarray, y: np.ndarray,
+                             max_iterations,
                              escape_radius,
                              smooth,
                              color_scheme,
                              num_computed,
-                             period_checking, memo)
-        return False, color
+                             period_checking, log2_log2_escape_radius=None, executor=None):
+    """
+    Calculates a whole BFS level of quadtree node regions in one dispatch.
 
-    color = np.array([-1.0, -1.0, -1.0])
+    The regions of a level are independent, so when an executor is supplied they are mapped
+    across its threads; calculate_segment spends its time in NumPy ufuncs that release the GIL,
+    so the walks genuinely overlap. Two boxes sharing a border edge may both compute it, but
+    they write identical values, so the shared pixels and seen mask stay consistent.
 
-    isMandelbrot = True
-    hasMandelbrot = False
+    Parameters:
+    - tree (QuadTreeFlat): The flat quadtree holding the node rows.
+    - level (list[int]): The node indices making up the level.
+    - executor (ThreadPoolExecutor): Optional thread pool to spread the level across.
+    - (remaining parameters as in calculate_quadtree)
+
+    Returns:
+    list[Tuple[bool, np.ndarray]]: One calculate_quadtree result per node, in level order.
+    """
 
-    for i in range(tl[0], br[0]):
-        border, inSet = calculate(x[i], y[tl[1]], max_iterations,
+    def work(node):
+        return calculate_quadtree(tree, node, pixels, seen, x, y,
+                                  max_iterations,
                                   escape_radius,
                                   smooth,
                                   color_scheme,
                                   num_computed,
-                                  period_checking, memo)
+                                  period_checking, log2_log2_escape_radius=log2_log2_escape_radius)
 
-        if not hasMandelbrot and inSet:
-            color = border
+    if executor is not None and len(level) > 1:
+        return list(executor.map(work, level))
 
-        isMandelbrot &= inSet
-        hasMandelbrot |= inSet
+    return [work(node) for node in level]
 
-        pixels[tl[1]][i] = border
 
-        border, inSet = calculate(x[i], y[br[1] - 1], max_iterations,
+def calculated_mixed_raster_level(tree: QuadTreeFlat, level, pixels: np.ndarray, seen: np.ndarray,
+                                  in_set: np.ndarray,
+                                  x: np.ndarray, y: np.ndarray,
+                                  max_iterations,
                                   escape_radius,
                                   smooth,
                                   color_scheme,
                                   num_computed,
-                                  period_checking, memo)
+                                  period_checking, log2_log2_escape_radius=None, executor=None):
+    """
+    Calculates a whole BFS level of mixed raster quadtree node regions in one dispatch.
 
-        if not hasMandelbrot and inSet:
-            color = border
+    The regions of a level are independent, so when an executor is supplied they are mapped
+    across its threads; see calculate_quadtree_level for why the shared caches stay consistent.
+    Pixels, in_set and seen are written in that order, so a lane whose seen flag reads True
+    always has its color and membership in place.
 
-        isMandelbrot &= inSet
-        hasMandelbrot |= inSet
+    Parameters:
+    - tree (QuadTreeFlat): The flat quadtree holding the node rows.
+    - level (list[int]): The node indices making up the level.
+    - executor (ThreadPoolExecutor): Optional thread pool to spread the level across.
+    - (remaining parameters as in calculated_mixed_raster_quadtree)
 
-        pixels[br[1] - 1][i] = border
+    Returns:
+    list[Tuple[bool, bool, np.ndarray]]: One calculated_mixed_raster_quadtree result per node,
+                                         in level order.
+    """
 
-    for j in range(tl[1], br[1]):
+    def work(node):
+        return calculated_mixed_raster_quadtree(tree, node, pixels, seen, in_set, x, y,
+                                                max_iterations,
+                                                escape_radius,
+                                                smooth,
+                                                color_scheme,
+                                                num_computed,
+                                                period_checking, log2_log2_escape_radius=log2_log2_escape_radius)
 
-        border, inSet = calculate(x[tl[0]], y[j], max_iterations,
-                                  escape_radius,
-                                  smooth,
-                                  color_scheme,
-                                  num_computed,
-                                  period_checking, memo)
+    if executor is not None and len(level) > 1:
+        return list(executor.map(work, level))
 
-        if not hasMandelbrot and inSet:
-            color = border
+    return [work(node) for node in level]
 
-        isMandelbrot &= inSet
-        hasMandelbrot |= inSet
 
-        pixels[j][tl[0]] = border
+def calculate_row(x_vals, y_vals, max_iterations, escape_radius_squared):
+    """
+    Iterates a batch of points through the Mandelbrot recurrence with whole-array NumPy ops.
 
-        border, inSet = calculate(x[br[0] - 1], y[j], max_iterations,
-                                  escape_radius,
-                                  smooth,
-                                  color_scheme,
-                                  num_computed,
-                                  period_checking, memo)
+    Every arithmetic step runs as one C loop over all still-alive lanes instead of a Python-level
+    loop per pixel, so the interpreter overhead is O(iterations) rather than O(pixels). Points in
+    the main cardioid or the period-2 bulb are marked dead up front since they never escape.
+    x_vals and y_vals follow
+    NumPy broadcasting, so a row (x array, y scalar) and a column (x scalar, y array) both work.
+
+    Parameters:
+    - x_vals: The x-coordinates of the points (array or scalar).
+    - y_vals: The y-coordinates of the points (array or scalar).
+    - max_iterations (int): The maximum number of iterations.
+    - escape_radius_squared (float): The squared escape radius.
+
+    Returns:
+    Tuple[np.ndarray, ...]: Arrays (iterations, final x, final y, derivative x, derivative y),
+                            one lane per point.
+    """
+
+    C = np.asarray(x_vals + 1j * np.asarray(y_vals, dtype=np.float64))
+    Z = np.zeros_like(C)
+    dZ = np.zeros_like(C)
+    iters = np.full(C.shape, max_iterations, dtype=np.int32)
+    alive = np.ones(C.shape, dtype=bool)
+
+    alive[in_main_body_vec(C.real, C.imag)] = False
+
+    for k in range(max_iterations):
+        if not alive.any():
+            break
+
+        Zt = Z[alive]
+        dZt = dZ[alive]
+
+        Zt = Zt * Zt + C[alive]
+        dZt = 2 * Zt * dZt + 1
+
+        escaped = Zt.real * Zt.real + Zt.imag * Zt.imag > escape_radius_squared
+
+        Z[alive] = Zt
+        dZ[alive] = dZt
+        iters.flat[np.flatnonzero(alive)[escaped]] = k + 1
+        alive[alive] = ~escaped
+
+    return iters, Z.real, Z.imag, dZ.real, dZ.imag
+
+
+def reference_orbit(c_real, c_imag, max_iterations, escape_radius_squared, precision=50):
+    """
+    Computes one high-precision Mandelbrot orbit for use as a perturbation reference.
+
+    Past roughly world_width < 1e-10 the FP64 grid coordinates collapse onto each other, so
+    iterating every pixel directly produces banding. Instead a single orbit is iterated in
+    arbitrary-precision arithmetic (the stdlib decimal module, so no extra dependency) and each
+    step is rounded down to complex128; the per-pixel work then happens on small FP64 deltas
+    against this orbit in calculate_perturbation.
+
+    Parameters:
+    - c_real (float): The real part of the reference point.
+    - c_imag (float): The imaginary part of the reference point.
+    - max_iterations (int): The maximum number of iterations.
+    - escape_radius_squared (float): The squared escape radius.
+    - precision (int): Decimal digits carried by the high-precision iteration.
+
+    Returns:
+    np.ndarray: Complex128 orbit values X_0..X_n, truncated at escape if the reference escapes.
+    """
+
+    with localcontext() as ctx:
+        ctx.prec = precision
+
+        cr = Decimal(c_real)
+        ci = Decimal(c_imag)
 
-        if not hasMandelbrot and inSet:
-            color = border
+        xr = Decimal(0)
+        xi = Decimal(0)
 
-        isMandelbrot &= inSet
-        hasMandelbrot |= inSet
+        orbit = np.empty(max_iterations + 1, dtype=np.complex128)
+        orbit[0] = 0
 
-        pixels[br[0] - 1][j] = border
+        for n in range(1, max_iterations + 1):
+            xr, xi = xr * xr - xi * xi + cr, 2 * xr * xi + ci
+            orbit[n] = complex(float(xr), float(xi))
 
-    return isMandelbrot != hasMandelbrot and (quad_tree.rows > 3 and quad_tree.cols > 3), color
+            if float(xr * xr + xi * xi) > escape_radius_squared:
+                return orbit[:n + 1]
+
+    return orbit
+
+
+def calculate_perturbation(dc, orbit, max_iterations, escape_radius_squared):
+    """
+    Iterates a grid of pixels as FP64 deltas against a high-precision reference orbit.
+
+    Each pixel's offset dc from the reference point evolves by the perturbation recurrence
+    dz_{n+1} = 2 * X_n * dz_n + dz_n^2 + dc, with the full value reconstructed as
+    z_n = X_n + dz_n only for the escape test. The deltas stay small, so FP64 keeps its
+    precision at zooms where the absolute coordinates no longer can. The derivative runs in
+    plain FP64 alongside, so distance estimates stay available. Same masked whole-array
+    iteration shape as calculate_row.
+
+    Parameters:
+    - dc (np.ndarray): Complex offsets of the pixels from the reference point.
+    - orbit (np.ndarray): The reference orbit from reference_orbit.
+    - max_iterations (int): The maximum number of iterations.
+    - escape_radius_squared (float): The squared escape radius.
+
+    Returns:
+    Tuple[np.ndarray, ...]: Arrays (iterations, final x, final y, derivative x, derivative y),
+                            matching calculate_row's contract.
+    """
+
+    dz = np.zeros_like(dc)
+    Z = np.zeros_like(dc)
+    dZ = np.zeros_like(dc)
+    iters = np.full(dc.shape, max_iterations, dtype=np.int32)
+    alive = np.ones(dc.shape, dtype=bool)
+
+    limit = min(max_iterations, orbit.shape[0] - 1)
+
+    for n in range(limit):
+        if not alive.any():
+            break
+
+        dzt = dz[alive]
+        z_prev = orbit[n] + dzt
+
+        dZt = 2 * z_prev * dZ[alive] + 1
+        dzt = 2 * orbit[n] * dzt + dzt * dzt + dc[alive]
+
+        z = orbit[n + 1] + dzt
+
+        escaped = z.real * z.real + z.imag * z.imag > escape_radius_squared
+
+        dz[alive] = dzt
+        Z[alive] = z
+        dZ[alive] = dZt
+        iters.flat[np.flatnonzero(alive)[escaped]] = n + 1
+        alive[alive] = ~escaped
+
+    return iters, Z.real, Z.imag, dZ.real, dZ.imag
 
 
 def row_raster(pixels: np.ndarray,
+               seen: np.ndarray,
                row: int,
                x: np.ndarray,
                y: np.ndarray,
@@ -327,12 +709,13 @@ def row_raster(pixels: np.ndarray,
                smooth,
                color_scheme,
                num_computed,
-               period_checking, memo=None):
+               period_checking, log2_log2_escape_radius=None):
     """
     Calculates the Mandelbrot set for a specific row using a raster approach.
 
     Parameters:
     - pixels (np.ndarray): The pixel array to store the calculated colors.
+    - seen (np.ndarray): Boolean mask of pixels that have already been computed.
     - row (int): The row index to calculate.
     - x (np.ndarray): The x-coordinates of the points.
     - y (np.ndarray): The y-coordinates of the points.
@@ -342,24 +725,61 @@ def row_raster(pixels: np.ndarray,
     - color_scheme (function): A function that maps Mandelbrot set parameters to a color.
     - num_computed (int): The number of points already computed.
     - period_checking (bool): Whether to perform periodicity checking.
-    - memo (dict): A memoization dictionary for caching computed points.
+    - log2_log2_escape_radius (float): Precomputed log2(log2(escape_radius)) for the render.
 
     Returns:
     int: The number of filled pixels in the row.
     """
 
-    unfilled_pixel = np.array([-1.0, -1.0, -1.0])
-    filled = 0
+    if log2_log2_escape_radius is None:
+        log2_log2_escape_radius = math.log2(math.log2(escape_radius))
 
-    for j, x_val in enumerate(x):
-        if (pixels[row][j] != unfilled_pixel).any():
-            color, _ = calculate(x_val, y[row], max_iterations,
-                                 escape_radius,
-                                 smooth,
-                                 color_scheme,
-                                 num_computed,
-                                 period_checking, memo)
-            pixels[row][j] = color
-            filled += 1
+    idx = np.flatnonzero(~seen[row])
+
+    if idx.size == 0:
+        return 0
+
+    iters, zx, zy, dzx, dzy = calculate_row(x[idx], y[row], max_iterations,
+                                            escape_radius * escape_radius)
+
+    needs_de = color_scheme in needs_distance_estimate
+
+    if needs_de:
+        z = zx * zx + zy * zy
+        dz = dzx * dzx + dzy * dzy
+
+    batch = batch_color_scheme.get(color_scheme)
+
+    if batch is not None:
+        distance_estimate = None
+
+        if needs_de:
+            escaped = iters != max_iterations
+            distance_estimate = np.full(idx.shape, np.nan)
+            distance_estimate[escaped] = np.log(z[escaped]) * np.sqrt(z[escaped] / dz[escaped])
+
+        pixels[row, idx] = batch(max_iteration=max_iterations,
+                                 iteration=iters,
+                                 distance_estimate=distance_estimate,
+                                 final=(zx, zy),
+                                 escape_radius=escape_radius,
+                                 smooth=smooth)
+    else:
+        for k, j in enumerate(idx):
+            iteration = int(iters[k])
+
+            distance_estimate = None
+            if needs_de and iteration != max_iterations:
+                distance_estimate = math.log(z[k]) * math.sqrt(z[k] / dz[k])
+
+            pixels[row][j] = color_scheme(max_iteration=max_iterations,
+                                          iteration=iteration,
+                                          distance_estimate=distance_estimate,
+                                          final=(zx[k], zy[k]),
+                                          escape_radius=escape_radius,
+                                          log2_log2_escape_radius=log2_log2_escape_radius,
+                                          smooth=smooth)
+
+    seen[row, idx] = True
 
-    return filled
+    return idx.size
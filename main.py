@@ -52,9 +52,9 @@ def denormalize(arr):
     arr (list[list[float]]): 2D array to denormalize.
 
     Returns:
-    list[list[int]]: Denormalized 2D array.
+    np.ndarray: Denormalized uint8 array.
     """
-    return [[int(val * 255) for val in row] for row in arr]
+    return (np.asarray(arr, dtype=np.float32) * 255.0).astype(np.uint8)
 
 
 def parse_arguments():
@@ -187,7 +187,7 @@ def set_photo_config(directory):
                     if config['colormap'] not in colormaps:
                         raise Exception(f"Provided colormap is not built in.")
 
-                    config['colormap'] = np.array(denormalize(colormaps[config['colormap']].colors), dtype=np.uint8)
+                    config['colormap'] = denormalize(colormaps[config['colormap']].colors)
 
                 else:
                     colormap_file_path = os.path.join(directory, config['colormap'])
@@ -1,38 +1,131 @@
+import functools
+
 import numpy as np
 
 
-class QuadTree:
-    def __init__(self, top_left, bottom_right):
+class QuadTreeFlat:
+    """
+    Structure-of-arrays quadtree over integer pixel boxes.
+
+    Every node is a row index into four parallel `np.int32` arrays (`tl_x`, `tl_y`,
+    `br_x`, `br_y`) instead of its own Python object, so the whole tree is a handful
+    of contiguous buffers rather than thousands of heap nodes chained by pointers.
+    Children of a node are stored in consecutive rows and addressed by
+    (`first_child`, `n_children`), which makes traversal an iterative walk over
+    plain ints.
+    """
+
+    def __init__(self, top_left, bottom_right, capacity=256):
         """
-        Initializes a QuadTree node with the specified top-left and bottom-right coordinates.
+        Initializes the tree with a single root node covering the given bounding box.
 
         Parameters:
-        top_left (tuple[int, int]): Top-left coordinates of the bounding box.
-        bottom_right (tuple[int, int]): Bottom-right coordinates of the bounding box.
+        top_left (tuple[int, int]): Top-left coordinates of the root bounding box.
+        bottom_right (tuple[int, int]): Bottom-right coordinates of the root bounding box.
+        capacity (int): Initial number of node rows to allocate; the arrays grow as needed.
+        """
+        self.tl_x = np.empty(capacity, dtype=np.int32)
+        self.tl_y = np.empty(capacity, dtype=np.int32)
+        self.br_x = np.empty(capacity, dtype=np.int32)
+        self.br_y = np.empty(capacity, dtype=np.int32)
+
+        self.first_child = np.full(capacity, -1, dtype=np.int32)
+        self.n_children = np.zeros(capacity, dtype=np.int32)
+
+        self.n_nodes = 0
+        self._append(int(top_left[0]), int(top_left[1]), int(bottom_right[0]), int(bottom_right[1]))
+
+    def _grow(self, needed):
+        """
+        Ensures capacity for at least `needed` nodes, doubling the arrays with np.resize.
+        """
+        capacity = self.tl_x.shape[0]
+
+        if needed <= capacity:
+            return
+
+        while capacity < needed:
+            capacity *= 2
+
+        self.tl_x = np.resize(self.tl_x, capacity)
+        self.tl_y = np.resize(self.tl_y, capacity)
+        self.br_x = np.resize(self.br_x, capacity)
+        self.br_y = np.resize(self.br_y, capacity)
+
+        first_child = np.full(capacity, -1, dtype=np.int32)
+        first_child[:self.n_nodes] = self.first_child[:self.n_nodes]
+        self.first_child = first_child
+
+        n_children = np.zeros(capacity, dtype=np.int32)
+        n_children[:self.n_nodes] = self.n_children[:self.n_nodes]
+        self.n_children = n_children
+
+    def _append(self, tl_x, tl_y, br_x, br_y):
+        """
+        Appends a node row and returns its index.
+        """
+        i = self.n_nodes
+        self._grow(i + 1)
+
+        self.tl_x[i] = tl_x
+        self.tl_y[i] = tl_y
+        self.br_x[i] = br_x
+        self.br_y[i] = br_y
+
+        self.n_nodes = i + 1
+        return i
+
+    def tl(self, i):
+        """
+        Returns the top-left corner of node `i` as an int tuple.
+        """
+        return int(self.tl_x[i]), int(self.tl_y[i])
+
+    def br(self, i):
+        """
+        Returns the bottom-right corner of node `i` as an int tuple.
         """
-        self.tl = top_left
-        self.br = bottom_right
+        return int(self.br_x[i]), int(self.br_y[i])
 
-        self.rows: int = self.br[1] - self.tl[1]
-        self.cols: int = self.br[0] - self.tl[0]
+    def rows(self, i):
+        """
+        Returns the number of pixel rows covered by node `i`.
+        """
+        return int(self.br_y[i] - self.tl_y[i])
+
+    def cols(self, i):
+        """
+        Returns the number of pixel columns covered by node `i`.
+        """
+        return int(self.br_x[i] - self.tl_x[i])
+
+    def children(self, i):
+        """
+        Returns the child indices of node `i` as a range (empty for leaves).
+        """
+        first = int(self.first_child[i])
+
+        if first < 0:
+            return range(0)
 
-        self.children: list[QuadTree] = []
+        return range(first, first + int(self.n_children[i]))
 
-    def split(self, boundary=1):
+    def split(self, i, boundary=1):
         """
-        Splits the current QuadTree node into four child nodes.
+        Splits node `i` into up to four child nodes appended as consecutive rows.
 
         Parameters:
+        i (int): Index of the node to split.
         boundary (int): Optional boundary to leave empty around each child node.
 
         Returns:
-        list[QuadTree]: List of four child QuadTree nodes after splitting.
+        range: Index range of the newly created children.
 
         Raises:
         Exception: If the node cannot be split.
         """
-        tl = np.array([self.tl[0] + boundary, self.tl[1] + boundary], dtype=np.int32)
-        br = np.array([self.br[0] - boundary, self.br[1] - boundary], dtype=np.int32)
+        tl = (int(self.tl_x[i]) + boundary, int(self.tl_y[i]) + boundary)
+        br = (int(self.br_x[i]) - boundary, int(self.br_y[i]) - boundary)
 
         cols = br[0] - tl[0]
         rows = br[1] - tl[1]
@@ -40,53 +133,37 @@ class QuadTree:
         if rows < 1 or cols < 1:
             raise Exception("Cannot split node.")
 
+        start = self.n_nodes
+
         if rows == 1 and cols == 1:
-            self.children = [
-                QuadTree(tl, br)
-            ]
-            return self.children
-
-        smaller_box_size = (cols // 2, rows // 2)
-
-        if rows == 1:
-            self.children = [
-                QuadTree(tl, np.array([tl[0] + smaller_box_size[0], br[1]], dtype=np.int32)),
-                QuadTree(np.array([tl[0] + smaller_box_size[0], tl[1]], dtype=np.int32), br)
-            ]
-            return self.children
-
-        if cols == 1:
-            self.children = [
-                QuadTree(tl, np.array([br[0], tl[1] + smaller_box_size[1]], dtype=np.int32)),
-                QuadTree(np.array([tl[0], tl[1] + smaller_box_size[1]], dtype=np.int32), br)
-            ]
-            return self.children
-
-        self.children = [
-            QuadTree(
-                tl, np.array([tl[0] + smaller_box_size[0], tl[1] + smaller_box_size[1]], dtype=np.int32)
-            ),
-            QuadTree(
-                np.array([tl[0] + smaller_box_size[0], tl[1]], dtype=np.int32),
-                np.array([br[0], tl[1] + smaller_box_size[1]], dtype=np.int32)
-            ),
-            QuadTree(
-                np.array([tl[0], tl[1] + smaller_box_size[1]], dtype=np.int32),
-                np.array([tl[0] + smaller_box_size[0], br[1]], dtype=np.int32)
-            ),
-            QuadTree(
-                np.array([tl[0] + smaller_box_size[0], tl[1] + smaller_box_size[1]], dtype=np.int32),
-                br
-            )
-        ]
-
-        return self.children
-
-    def fill_array(self, array, value, boundary=1):
-        """
-        Fills a portion of a 2D array with a specified value based on the current QuadTree node.
+            self._append(tl[0], tl[1], br[0], br[1])
+        elif rows == 1:
+            half = cols // 2
+            self._append(tl[0], tl[1], tl[0] + half, br[1])
+            self._append(tl[0] + half, tl[1], br[0], br[1])
+        elif cols == 1:
+            half = rows // 2
+            self._append(tl[0], tl[1], br[0], tl[1] + half)
+            self._append(tl[0], tl[1] + half, br[0], br[1])
+        else:
+            half_x = cols // 2
+            half_y = rows // 2
+            self._append(tl[0], tl[1], tl[0] + half_x, tl[1] + half_y)
+            self._append(tl[0] + half_x, tl[1], br[0], tl[1] + half_y)
+            self._append(tl[0], tl[1] + half_y, tl[0] + half_x, br[1])
+            self._append(tl[0] + half_x, tl[1] + half_y, br[0], br[1])
+
+        self.first_child[i] = start
+        self.n_children[i] = self.n_nodes - start
+
+        return range(start, self.n_nodes)
+
+    def fill_array(self, i, array, value, boundary=1):
+        """
+        Fills the region of node `i` in a 2D array with a value as one indexed assignment.
 
         Parameters:
+        i (int): Index of the node whose region to fill.
         array (numpy.ndarray): 2D array to fill.
         value: Value to fill in the array.
         boundary (int): Optional boundary to leave empty around the filled area.
@@ -97,18 +174,56 @@ class QuadTree:
         Raises:
         Exception: If the input array is too small.
         """
-        if len(array) < self.br[1] and len(array[0]) < self.br[0]:
+        if len(array) < self.br_y[i] and len(array[0]) < self.br_x[i]:
             raise Exception("Array too small")
 
-        array[self.tl[1] + boundary: self.br[1] - boundary, self.tl[0] + boundary: self.br[0] - boundary] = value
+        array[self.tl_y[i] + boundary: self.br_y[i] - boundary,
+              self.tl_x[i] + boundary: self.br_x[i] - boundary] = value
 
         return array
 
-    def __str__(self) -> str:
+    def copy(self):
         """
-        Returns a string representation of the QuadTree node.
+        Returns an independent copy of the tree sharing no buffers with the original.
+        """
+        clone = QuadTreeFlat.__new__(QuadTreeFlat)
 
-        Returns:
-        str: String representation of the QuadTree node.
+        clone.tl_x = self.tl_x.copy()
+        clone.tl_y = self.tl_y.copy()
+        clone.br_x = self.br_x.copy()
+        clone.br_y = self.br_y.copy()
+        clone.first_child = self.first_child.copy()
+        clone.n_children = self.n_children.copy()
+        clone.n_nodes = self.n_nodes
+
+        return clone
+
+    def __str__(self) -> str:
+        """
+        Returns a string representation of the tree as one node per line.
         """
-        return f"{self.tl} {self.br}"
+        return "\n".join(f"{self.tl(i)} {self.br(i)}" for i in range(self.n_nodes))
+
+
+@functools.lru_cache(maxsize=8)
+def build_quadtree(width, height):
+    """
+    Builds the seeded tree template for an image shape, memoized by (width, height).
+
+    The root split into its four boundary-free quadrants is the only part of the tree that
+    depends on the shape alone — deeper splits are decided per frame from the rendered border
+    colors, so they cannot be shared. Repeated renders at one size (e.g. the frames of a zoom
+    video) start from a copy of the cached template instead of reallocating and reseeding the
+    node arrays each time.
+
+    Parameters:
+    width (int): Image width in pixels.
+    height (int): Image height in pixels.
+
+    Returns:
+    QuadTreeFlat: Template tree with the root split into quadrants; copy() it before mutating.
+    """
+    tree = QuadTreeFlat((0, 0), (width, height))
+    tree.split(0, boundary=0)
+
+    return tree
@@ -1,7 +1,7 @@
 import unittest
 import numpy as np
 
-from Accelerated.calculation import in_main_body, calculate
+from Accelerated.calculation import in_main_body, make_calculate
 
 
 class TestFractalFunctions(unittest.TestCase):
@@ -21,11 +21,15 @@ class TestFractalFunctions(unittest.TestCase):
         color_map = np.array([[255, 0, 0]], dtype=np.uint8)
         period_checking = False
 
-        result = calculate(x0, y0, max_iterations, escape_radius, smooth, color_scheme, color_map, period_checking)
+        log2_log2_escape_radius = float(np.log2(np.log2(escape_radius)))
 
-        # Assuming the output format is [isMaxIteration, R, G, B]
-        self.assertEqual(len(result), 4)
-        self.assertTrue(result[0] == 1)
+        calculate = make_calculate(color_scheme, smooth, period_checking)
+
+        color = np.zeros(4, dtype=np.uint8)
+        is_max_iteration = calculate(x0, y0, max_iterations, escape_radius, log2_log2_escape_radius,
+                                     color_map, color)
+
+        self.assertTrue(is_max_iteration == 1)
 
 
 if __name__ == '__main__':